@@ -1,17 +1,36 @@
 import os
+import io
+import csv
 import time
 import sys
+import logging
+from array import array
 from contextlib import AbstractContextManager
-from threading import Lock
+from dataclasses import dataclass, field
+from queue import Queue
+from threading import Lock, Thread
 from enum import Enum
+from itertools import islice
+
+import numpy as np
 
 # Import the kbio libraries
 from kbio.kbio_api import KBIO_api
 from kbio.kbio_types import BOARD_TYPE, ERROR
-from kbio.kbio_types import I_RANGE, PROG_STATE
+from kbio.kbio_types import I_RANGE, PROG_STATE, CurrentValues
 from kbio.utils import exception_brief, warn_diff
 from kbio.c_utils import c_is_64b
-from kbio.kbio_tech import ECC_parm, make_ecc_parm, make_ecc_parms, get_experiment_data, get_info_data
+from kbio.kbio_tech import ECC_parm, make_ecc_parm, make_ecc_parms, update_ecc_parm
+from kbio.kbio_tech import get_experiment_data, get_info_data
+from kbio.tech_types import TECH_ID
+
+# Channel and phase progress messages go through logging so the polling path
+# does no console I/O unless the application configures a handler
+logger = logging.getLogger("biologic")
+logger.addHandler(logging.NullHandler())
+
+# Columns of the run_cp_cycle() CSV; data rows are formatted by hand in _process_phase()
+CSV_HEADER = ("Cycle", "Phase", "Time(s)", "Voltage(V)", "Current(A)", "State")
 
 
 class ChargeState(Enum):
@@ -21,6 +40,90 @@ class ChargeState(Enum):
     DISCHARGING = 2
 
 
+@dataclass
+class PhaseData:
+    """Data collected during one charge or discharge phase, stored column by column."""
+    cycle: int
+    phase: str
+    times: array = field(default_factory=lambda: array("d"))
+    voltages: array = field(default_factory=lambda: array("d"))
+    currents: array = field(default_factory=lambda: array("d"))
+    states: array = field(default_factory=lambda: array("B"))  # ChargeState values
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, timestamp, voltage, current, state):
+        """Append one sample to the columns."""
+        self.times.append(timestamp)
+        self.voltages.append(voltage)
+        self.currents.append(current)
+        self.states.append(state.value)
+
+
+def _first_cutoff_index(voltages, cutoff_voltage, cutoff_hit):
+    """Return the index of the first voltage for which cutoff_hit(voltage, cutoff) holds, or -1."""
+    hits = cutoff_hit(np.asarray(voltages, dtype=float), cutoff_voltage)
+    index = int(np.argmax(hits)) if hits.size else 0
+    return index if hits.size and hits[index] else -1
+
+
+def _csv_header_bytes(columns):
+    """Render a header row with the csv module, so column names are quoted if ever needed."""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerow(columns)
+    return buf.getvalue().encode()
+
+
+def _write_all(fd, data):
+    """Write all of data to the file descriptor fd, retrying on partial writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+# Queued to the CSV writer at the end of each phase: write out and fsync pending rows
+_FLUSH = object()
+
+
+def _csv_writer_worker(log_queue, fd, errors, buffer_size=64 * 1024, flush_interval_s=5.0):
+    """
+    Drain formatted CSV lines from log_queue into the file descriptor fd until a None sentinel is received.
+
+    Lines are encoded into a byte buffer which is written with a single system call
+    once buffer_size bytes are pending or flush_interval_s has passed since the last
+    write, when _FLUSH is received (followed by an fsync), and once more at the sentinel.
+    A write error is appended to errors for the producer to raise; later lines are
+    then drained and discarded so they do not pile up in memory.
+    """
+    pending = bytearray()
+    last_write = time.monotonic()
+    while True:
+        line = log_queue.get()
+        if line is None:
+            break
+        if errors:
+            continue
+        flush = line is _FLUSH
+        if not flush:
+            pending += line.encode()
+        if flush or len(pending) >= buffer_size or time.monotonic() - last_write >= flush_interval_s:
+            try:
+                _write_all(fd, pending)
+                if flush:
+                    os.fsync(fd)
+                pending.clear()
+            except Exception as e:
+                errors.append(e)
+                pending = bytearray()  # The error's traceback still holds a view of the old one
+            last_write = time.monotonic()
+    if not errors:
+        try:
+            _write_all(fd, pending)
+        except Exception as e:
+            errors.append(e)
+
+
 class BioLogicInterface(AbstractContextManager):
     """
     Interface for BioLogic potentiostats/galvanostats using EC-Lab Development Package.
@@ -36,19 +139,32 @@ class BioLogicInterface(AbstractContextManager):
         "timebase": ECC_parm("tb", int),
     }
 
-    def __init__(self, eclib_dll_path, blfind_dll_path=None):
+    def __init__(self, eclib_dll_path, blfind_dll_path=None, thread_safe=False):
         """
         Initialize the BioLogic interface.
 
         Args:
             eclib_dll_path: Path to EClib.dll or EClib64.dll
             blfind_dll_path: Path to blfind.dll (optional)
+            thread_safe: Serialize reads with a lock when shared between threads
         """
         self.api = KBIO_api(eclib_file=eclib_dll_path, blfind_file=blfind_dll_path)
         self.connection_id = None
         self.connected = False
-        self._lock = Lock()  # For thread safety
+        self._lock = Lock() if thread_safe else None  # Only needed for threaded use
         self.device_info = None
+        self._plugged_channels = None  # Cached per connection by get_plugged_channels
+        self._values_buf = None  # CurrentValues filled in place by read_values
+        self._tech_name_cache = {}  # Technique loaded on each channel, by channel number
+        self._active_channels = set()  # Channels started through this interface and not yet stopped
+
+        # CP parameter structures are built once and refreshed in place on every technique load
+        self._cp_parm_templates = {
+            key: make_ecc_parm(self.api, parm) for key, parm in self.CP_PARAMS.items()
+        }
+        # Complete CP EccParams by (duration, record_interval, timebase); between phases only
+        # the current and the voltage limit change, and those are refreshed inside the array
+        self._cp_parms_cache = {}
 
     def __enter__(self) -> "BioLogicInterface":  # type: ignore[override]
         return self
@@ -68,10 +184,11 @@ class BioLogicInterface(AbstractContextManager):
             True if connection successful, False otherwise
         """
         try:
-            print(f"Connecting to {address} ...")
             self.connection_id, self.device_info = self.api.Connect(address, timeout_s)
             self.connected = True
-            print("Connected successfully to BioLogic device.")
+            self._plugged_channels = None
+            self._values_buf = CurrentValues()
+            print(f"Connected successfully to BioLogic device at {address}.")
             return True
         except Exception as e:
             print("Connection error:", exception_brief(e, extended=True))
@@ -160,6 +277,25 @@ class BioLogicInterface(AbstractContextManager):
         """Compatibility helper used by Main.py."""
         return not self.is_channel_running(channel)
 
+    def poll_channel(self, channel, board_type=None):
+        """
+        Fetch new data and the channel status with a single GetData call.
+
+        Use this instead of combining get_experiment_data() with is_channel_running()
+        in polling loops, as the data buffer already carries the channel state.
+
+        Args:
+            channel: Channel number (1-based)
+            board_type: Board type of the channel (optional, will be queried if not provided)
+
+        Returns:
+            Tuple of (status, technique_name, data_points, running)
+            where data_points is an iterator, as returned by get_experiment_data()
+        """
+        data = self.get_data(channel)
+        status, tech_name, data_points = self.get_experiment_data(channel, data, board_type)
+        return status, tech_name, data_points, status == PROG_STATE.RUN.name
+
     def get_plugged_channels(self):
         """
         Get a list of available channels.
@@ -170,16 +306,10 @@ class BioLogicInterface(AbstractContextManager):
         if not self.connected:
             raise RuntimeError("Not connected to instrument")
 
-        channels = []
-        for i in range(1, 17):  # Trying channels 1-16
-            try:
-                info = self.get_channel_info(i)
-                # Instead of relying on IsConnected, check if info itself is valid
-                channels.append(i)  # Assume channel is usable if no exception
-            except Exception as e:
-                # If cannot read info, skip
-                continue
-        return channels
+        # A single GetChannelsPlugged call covers every slot; the result is kept until reconnecting
+        if self._plugged_channels is None:
+            self._plugged_channels = list(self.api.PluggedChannels(self.connection_id))
+        return list(self._plugged_channels)
 
     def start_channel(self, channel):
         """
@@ -192,7 +322,8 @@ class BioLogicInterface(AbstractContextManager):
             raise RuntimeError("Not connected to instrument")
 
         self.api.StartChannel(self.connection_id, channel)
-        print(f"Channel {channel} started")
+        self._active_channels.add(channel)
+        logger.info("Channel %s started", channel)
 
     def stop_channel(self, channel):
         """
@@ -205,7 +336,9 @@ class BioLogicInterface(AbstractContextManager):
             raise RuntimeError("Not connected to instrument")
 
         self.api.StopChannel(self.connection_id, channel)
-        print(f"Channel {channel} stopped")
+        self._tech_name_cache.pop(channel, None)
+        self._active_channels.discard(channel)
+        logger.info("Channel %s stopped", channel)
 
     def read_values(self, channel):
         """
@@ -215,11 +348,15 @@ class BioLogicInterface(AbstractContextManager):
             channel: Channel number (1-based)
 
         Returns:
-            CurrentValues object with Ewe, I, etc.
+            CurrentValues object with Ewe, I, etc. Unless thread_safe is set, the same
+            object is refilled by the next call, so read the fields you need right away.
         """
         if not self.connected:
             raise RuntimeError("Not connected to instrument")
 
+        if self._lock is None:
+            return self.api.GetCurrentValues(self.connection_id, channel, self._values_buf)
+        # Shared between threads: hand each caller its own structure
         with self._lock:
             return self.api.GetCurrentValues(self.connection_id, channel)
 
@@ -249,6 +386,19 @@ class BioLogicInterface(AbstractContextManager):
         values = self.read_values(channel)
         return values.I
 
+    def read_voltage_and_current(self, channel):
+        """
+        Read voltage (Ewe) and current (I) from a channel in a single call.
+
+        Args:
+            channel: Channel number (1-based)
+
+        Returns:
+            Tuple of (voltage in volts, current in amps)
+        """
+        values = self.read_values(channel)
+        return values.Ewe, values.I
+
     def create_cp_parameters(self, current, duration, record_interval, voltage_limit, timebase=1):
         """
         Create parameters for Chronopotentiometry (CP) technique.
@@ -261,19 +411,43 @@ class BioLogicInterface(AbstractContextManager):
             timebase: Time base for the technique (default=1)
 
         Returns:
-            ECC parameters object for CP technique
-        """
+            ECC parameters object for CP technique; it is reused (and refreshed) by later
+            calls with the same duration, record interval and timebase
+        """
+        shape = (duration, record_interval, timebase)
+        cached = self._cp_parms_cache.get(shape)
+        if cached is not None:
+            # Same protocol shape: only refresh the two values that differ between phases.
+            # Indices follow the order of the values dict below
+            if self._lock is not None:
+                with self._lock:
+                    return self._refresh_cp_parameters(cached, current, voltage_limit)
+            return self._refresh_cp_parameters(cached, current, voltage_limit)
+
+        values = {
+            "current": current,
+            "duration": duration,
+            "record_interval": record_interval,
+            "voltage_limit": voltage_limit,
+        }
+
+        if timebase != 1:
+            values["timebase"] = timebase
+
         params = [
-            make_ecc_parm(self.api, self.CP_PARAMS["current"], current),
-            make_ecc_parm(self.api, self.CP_PARAMS["duration"], duration),
-            make_ecc_parm(self.api, self.CP_PARAMS["record_interval"], record_interval),
-            make_ecc_parm(self.api, self.CP_PARAMS["voltage_limit"], voltage_limit)
+            update_ecc_parm(self.api, self._cp_parm_templates[key], self.CP_PARAMS[key], value)
+            for key, value in values.items()
         ]
 
-        if timebase != 1:
-            params.append(make_ecc_parm(self.api, self.CP_PARAMS["timebase"], timebase))
+        ecc_parms = make_ecc_parms(self.api, *params)
+        self._cp_parms_cache[shape] = ecc_parms
+        return ecc_parms
 
-        return make_ecc_parms(self.api, *params)
+    def _refresh_cp_parameters(self, ecc_parms, current, voltage_limit):
+        """Redefine current (index 0) and voltage limit (index 3) inside a cached CP EccParams."""
+        update_ecc_parm(self.api, ecc_parms.pParams[0], self.CP_PARAMS["current"], current)
+        update_ecc_parm(self.api, ecc_parms.pParams[3], self.CP_PARAMS["voltage_limit"], voltage_limit)
+        return ecc_parms
 
     def load_cp_technique(self, channel, current, duration, record_interval, voltage_limit):
         """
@@ -292,9 +466,11 @@ class BioLogicInterface(AbstractContextManager):
         if not self.connected:
             raise RuntimeError("Not connected to instrument")
 
+        self._tech_name_cache.pop(channel, None)
         try:
             params = self.create_cp_parameters(current, duration, record_interval, voltage_limit)
             self.api.LoadTechnique(self.connection_id, channel, "cp.ecc", params)
+            self._tech_name_cache[channel] = TECH_ID.CP.name
             return True
         except Exception as e:
             print("Error loading CP technique:", exception_brief(e, extended=True))
@@ -316,6 +492,20 @@ class BioLogicInterface(AbstractContextManager):
             return ChargeState.DISCHARGING
         return ChargeState.IDLE
 
+    def determine_charge_states(self, currents):
+        """
+        Determine battery charge states for a batch of currents in one pass.
+
+        Args:
+            currents: Sequence or array of currents in amps
+
+        Returns:
+            numpy array of ChargeState values
+        """
+        currents = np.asarray(currents, dtype=float)
+        return np.where(currents > 0.01, ChargeState.CHARGING.value,
+                        np.where(currents < -0.01, ChargeState.DISCHARGING.value, ChargeState.IDLE.value))
+
     def get_data(self, channel):
         """
         Get raw data from the channel.
@@ -331,17 +521,19 @@ class BioLogicInterface(AbstractContextManager):
 
         return self.api.GetData(self.connection_id, channel)
 
-    def get_experiment_data(self, channel, data=None):
+    def get_experiment_data(self, channel, data=None, board_type=None):
         """
         Get experiment data in a more accessible format.
 
         Args:
             channel: Channel number (1-based)
             data: Raw data from get_data() (optional, will be fetched if not provided)
+            board_type: Board type of the channel (optional, will be queried if not provided)
 
         Returns:
             Tuple of (status, technique_name, data_points)
-            where data_points is a list of dictionaries with experiment values
+            where data_points is an iterator of dictionaries with experiment values,
+            decoded lazily as it is consumed
         """
         if not self.connected:
             raise RuntimeError("Not connected to instrument")
@@ -349,12 +541,54 @@ class BioLogicInterface(AbstractContextManager):
         if data is None:
             data = self.get_data(channel)
 
-        board_type = self.get_board_type(channel)
-        status, tech_name = get_info_data(self.api, data)
-        data_points = list(get_experiment_data(self.api, data, tech_name, board_type))
+        if board_type is None:
+            board_type = self.get_board_type(channel)
+
+        tech_name = self._tech_name_cache.get(channel)
+        if tech_name is None:
+            status, tech_name = get_info_data(self.api, data)
+        else:
+            # The technique is known from the last load, only the channel state needs decoding
+            current_values, _, _ = data
+            status = PROG_STATE(current_values.State).name
+        data_points = get_experiment_data(self.api, data, tech_name, board_type)
 
         return status, tech_name, data_points
 
+    def list_experiment_data(self, channel, data=None, board_type=None):
+        """
+        Same as get_experiment_data(), with data_points returned as a list.
+
+        Args:
+            channel: Channel number (1-based)
+            data: Raw data from get_data() (optional, will be fetched if not provided)
+            board_type: Board type of the channel (optional, will be queried if not provided)
+
+        Returns:
+            Tuple of (status, technique_name, data_points)
+            where data_points is a list of dictionaries with experiment values
+        """
+        status, tech_name, data_points = self.get_experiment_data(channel, data, board_type)
+        return status, tech_name, list(data_points)
+
+    def get_experiment_samples(self, channel, data=None, board_type=None):
+        """
+        Same as get_experiment_data(), with each record packed into a (time, voltage, current) tuple.
+
+        Args:
+            channel: Channel number (1-based)
+            data: Raw data from get_data() (optional, will be fetched if not provided)
+            board_type: Board type of the channel (optional, will be queried if not provided)
+
+        Returns:
+            Tuple of (status, technique_name, samples)
+            where samples is a list of (t, Ewe, I) tuples, with I read from 'I' or else 'Iwe'
+        """
+        status, tech_name, data_points = self.get_experiment_data(channel, data, board_type)
+        samples = [(p.get('t', 0), p.get('Ewe', 0), p['I'] if 'I' in p else p.get('Iwe', 0))
+                   for p in data_points]
+        return status, tech_name, samples
+
     def run_cp_cycle(self, channel, charge_current, discharge_current,
                      cutoff_voltage, duration, record_interval,
                      output_file=None, cycles=1):
@@ -372,7 +606,7 @@ class BioLogicInterface(AbstractContextManager):
             cycles: Number of cycles to run
 
         Returns:
-            A list of collected data points
+            A list of PhaseData records, one per phase
         """
         if not self.connected:
             raise RuntimeError("Not connected to instrument")
@@ -382,11 +616,30 @@ class BioLogicInterface(AbstractContextManager):
         discharge_current = -abs(discharge_current)
 
         all_data = []
-        file_obj = None
+        fd = None
+        log_queue = None
+        log_errors = []
+        writer_thread = None
+
+        # The board type never changes, so query it once for the whole run
+        board_type = self.get_board_type(channel)
 
         if output_file:
-            file_obj = open(output_file, "w")
-            file_obj.write("Cycle,Phase,Time(s),Voltage(V),Current(A),State\n")
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+            fd = os.open(output_file, flags)
+            _write_all(fd, _csv_header_bytes(CSV_HEADER))
+
+            # Disk writes happen on a background thread so they never delay the next poll
+            log_queue = Queue()
+            writer_thread = Thread(target=_csv_writer_worker, args=(log_queue, fd, log_errors), daemon=True)
+            writer_thread.start()
+
+        def end_phase():
+            """Have the phase's rows written out, and stop the run if the writer has failed."""
+            if log_queue is not None:
+                log_queue.put(_FLUSH)
+            if log_errors:
+                raise log_errors[0]
 
         try:
             for cycle in range(1, cycles + 1):
@@ -397,8 +650,11 @@ class BioLogicInterface(AbstractContextManager):
                 self.load_cp_technique(channel, charge_current, duration, record_interval, cutoff_voltage)
                 self.start_channel(channel)
 
-                charge_data = self._process_phase(channel, "Charge", cutoff_voltage, file_obj, cycle)
-                all_data.extend(charge_data)
+                charge_data = self._process_phase(channel, "Charge", cutoff_voltage, log_queue, cycle,
+                                                  board_type=board_type, record_interval=record_interval,
+                                                  log_errors=log_errors)
+                all_data.append(charge_data)
+                end_phase()
 
                 # Discharge phase
                 print("Starting discharge phase...")
@@ -406,8 +662,11 @@ class BioLogicInterface(AbstractContextManager):
                 self.load_cp_technique(channel, discharge_current, duration, record_interval, lower_cutoff)
                 self.start_channel(channel)
 
-                discharge_data = self._process_phase(channel, "Discharge", lower_cutoff, file_obj, cycle)
-                all_data.extend(discharge_data)
+                discharge_data = self._process_phase(channel, "Discharge", lower_cutoff, log_queue, cycle,
+                                                     board_type=board_type, record_interval=record_interval,
+                                                     log_errors=log_errors)
+                all_data.append(discharge_data)
+                end_phase()
 
             return all_data
 
@@ -418,10 +677,17 @@ class BioLogicInterface(AbstractContextManager):
             print("Error during CP cycle:", exception_brief(e, extended=True))
             return all_data
         finally:
-            if file_obj:
-                file_obj.close()
-
-    def _process_phase(self, channel, phase_name, cutoff_voltage, file_obj=None, cycle=1):
+            if writer_thread:
+                log_queue.put(None)
+                writer_thread.join()
+            if fd is not None:
+                os.close(fd)
+            # Rows were lost: report it to the caller rather than returning as if complete
+            if log_errors:
+                raise log_errors[0]
+
+    def _process_phase(self, channel, phase_name, cutoff_voltage, log_queue=None, cycle=1, board_type=None,
+                       record_interval=None, log_errors=None):
         """
         Process a single charge or discharge phase.
 
@@ -429,64 +695,129 @@ class BioLogicInterface(AbstractContextManager):
             channel: Channel number (1-based)
             phase_name: Name of the phase ("Charge" or "Discharge")
             cutoff_voltage: Cutoff voltage value
-            file_obj: File object for data logging (optional)
+            log_queue: Queue feeding the CSV writer thread (optional)
             cycle: Current cycle number
+            board_type: Board type of the channel (optional, queried once if not provided)
+            record_interval: Expected time between records in seconds (optional)
+            log_errors: List the CSV writer thread appends its write errors to (optional)
 
         Returns:
-            List of data points collected during this phase
-        """
-        data_points = []
-        check_interval = 0.5  # Polling interval in seconds
-
-        while True:
-            try:
-                status, tech_name, samples = self.get_experiment_data(channel)
-
-                for sample in samples:
-                    # Extract key data
-                    timestamp = sample.get('t', 0)
-                    voltage = sample.get('Ewe', 0)
-                    current = sample.get('I', 0) if 'I' in sample else sample.get('Iwe', 0)
-                    state = self.determine_charge_state(current)
-
+            PhaseData with the samples collected during this phase
+        """
+        data_points = PhaseData(cycle, phase_name)
+
+        # Adaptive polling: poll quickly right after the next record is due,
+        # back off while the device has nothing new to report
+        min_interval = 0.05  # Polling interval bounds in seconds
+        max_interval = 1.0
+        interval = min_interval
+        next_expected = time.monotonic()
+
+        # Polls that overrun their deadline several times in a row widen the interval
+        overruns = 0
+        max_overruns = 5
+
+        if board_type is None:
+            board_type = self.get_board_type(channel)
+
+        charge_states = tuple(ChargeState)  # Indexed by ChargeState value
+        state_names = tuple(state.name for state in charge_states)
+        row_fmt = f"{cycle},{phase_name},%r,%r,%r,%s\n"  # Constant for the whole phase
+
+        # The cutoff direction only depends on the phase, so pick the comparison once
+        if phase_name == "Charge":
+            cutoff_hit = np.greater_equal
+        elif phase_name == "Discharge":
+            cutoff_hit = np.less_equal
+        else:
+            cutoff_hit = None
+
+        # Bound once: these are looked up on every poll or every sample
+        read_values = self.read_values
+        get_samples = self.get_experiment_samples
+        classify = self.determine_charge_states
+        append_point = data_points.append
+        put_row = log_queue.put if log_queue is not None else None
+        monotonic = time.monotonic
+        sleep = time.sleep
+        run_state, run_name = PROG_STATE.RUN.value, PROG_STATE.RUN.name
+
+        # A single try block covers the whole loop, rather than one per poll
+        try:
+            while self.connected:
+                poll_start = monotonic()
+                # GetCurrentValues is much lighter than GetData: while the channel runs
+                # with nothing buffered, skip the data transfer for this poll
+                values = read_values(channel)
+                if values.MemFilled == 0 and values.State == run_state:
+                    status, samples = run_name, []
+                else:
+                    # One GetData round-trip per poll; board type is reused across polls.
+                    # Records arrive already packed as (t, Ewe, I) tuples
+                    status, tech_name, samples = get_samples(channel, None, board_type)
+
+                # Split into columns, then classify every sample at once
+                times, voltages, currents = zip(*samples) if samples else ((), (), ())
+                state_codes = classify(currents).tolist()
+
+                # Check for voltage limit based on phase; samples after the cutoff are dropped
+                if cutoff_hit is not None:
+                    cutoff_index = _first_cutoff_index(voltages, cutoff_voltage, cutoff_hit)
+                else:
+                    cutoff_index = -1
+                nb_kept = cutoff_index + 1 if cutoff_index >= 0 else len(times)
+
+                rows = list(islice(zip(times, voltages, currents, state_codes), nb_kept))
+                for timestamp, voltage, current, state_code in rows:
                     # Store data point
-                    data_point = {
-                        'cycle': cycle,
-                        'phase': phase_name,
-                        'time': timestamp,
-                        'voltage': voltage,
-                        'current': current,
-                        'state': state.name
-                    }
-                    data_points.append(data_point)
-
-                    # Log to file if provided
-                    if file_obj:
-                        record = f"{cycle},{phase_name},{timestamp},{voltage},{current},{state.name}\n"
-                        file_obj.write(record)
-                        file_obj.flush()
-
-                    # Check for voltage limit based on phase
-                    if phase_name == "Charge" and voltage >= cutoff_voltage:
-                        print(f"Charge complete: reached cutoff voltage {cutoff_voltage}V")
-                        self.stop_channel(channel)
-                        return data_points
-                    elif phase_name == "Discharge" and voltage <= cutoff_voltage:
-                        print(f"Discharge complete: reached cutoff voltage {cutoff_voltage}V")
-                        self.stop_channel(channel)
-                        return data_points
-
-                # Check if the channel has stopped
+                    append_point(timestamp, voltage, current, charge_states[state_code])
+
+                # Hand the whole poll to the writer thread as one string if logging
+                if put_row is not None and rows:
+                    if log_errors:
+                        raise log_errors[0]  # The writer thread has failed; stop the phase
+                    put_row("".join([row_fmt % (timestamp, voltage, current, state_names[state_code])
+                                     for timestamp, voltage, current, state_code in rows]))
+
+                if cutoff_index >= 0:
+                    logger.info("%s complete: reached cutoff voltage %sV", phase_name, cutoff_voltage)
+                    self.stop_channel(channel)
+                    return data_points
+
+                # Check if the channel has stopped, using the status carried by the data buffer
                 if status == "STOP":
-                    print(f"{phase_name} complete: technique finished")
+                    logger.info("%s complete: technique finished", phase_name)
                     return data_points
 
-                time.sleep(check_interval)
+                now = monotonic()
+                if times:
+                    interval = min_interval
+                    next_expected = now + (record_interval or 0)
+                elif now >= next_expected:
+                    interval = min(interval * 1.5, max_interval)
+
+                # The deadline counts from the start of this poll, so time spent in the DLL
+                # and in processing is not added on top of the interval
+                deadline = poll_start + min(max(interval, next_expected - poll_start), max_interval)
+                sleep_for = deadline - now
+                if sleep_for > 0:
+                    overruns = 0
+                    sleep(sleep_for)
+                else:
+                    overruns += 1
+                    if overruns >= max_overruns:
+                        logger.warning("%s: %d polls in a row overran their deadline, widening the interval",
+                                       phase_name, overruns)
+                        min_interval = min(min_interval * 2, max_interval)
+                        overruns = 0
 
-            except Exception as e:
-                print(f"Error during {phase_name}: {exception_brief(e)}")
-                self.stop_channel(channel)
-                return data_points
+        except Exception as e:
+            print(f"Error during {phase_name}: {exception_brief(e)}")
+            self.stop_channel(channel)
+            return data_points
+
+        # Connection was closed while polling
+        return data_points
 
     def disconnect(self):
         """
@@ -496,6 +827,10 @@ class BioLogicInterface(AbstractContextManager):
             self.api.Disconnect(self.connection_id)
             self.connected = False
             self.connection_id = None
+            self._plugged_channels = None
+            self._tech_name_cache.clear()  # Techniques may be reloaded by others before we reconnect
+            # _active_channels is kept: disconnecting does not stop a channel, and a later
+            # shutdown() should still try the ones that failed to stop
             print("Disconnected from instrument")
 
     def shutdown(self):
@@ -504,12 +839,29 @@ class BioLogicInterface(AbstractContextManager):
         """
         if self.connected:
             try:
-                # Try to stop all possible channels
-                for channel in range(1, 17):
-                    try:
-                        self.stop_channel(channel)
-                    except:
-                        pass
+                try:
+                    # Stop the channels this interface started with a single StopChannels call;
+                    # if none are tracked (started elsewhere), stop every plugged channel instead
+                    channels = set(self._active_channels) or set(self.get_plugged_channels())
+                    if channels:
+                        if self.api.StopChannels(self.connection_id, self.api.channel_map(channels)):
+                            # Only channels known to have stopped leave the tracked set
+                            self._active_channels -= channels
+                        else:
+                            # StopChannels only prints per-channel errors: retry each channel on
+                            # its own so one failure does not leave the others unattempted
+                            for channel in sorted(channels):
+                                try:
+                                    self.stop_channel(channel)
+                                except Exception as e:
+                                    logger.warning("Channel %s did not stop: %s", channel, exception_brief(e))
+                except:
+                    # Fall back to trying all possible channels one by one
+                    for channel in range(1, 17):
+                        try:
+                            self.stop_channel(channel)
+                        except:
+                            pass
                 self.disconnect()
             except:
                 pass  # Ensure we don't propagate exceptions during emergency shutdown
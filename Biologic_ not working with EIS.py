@@ -7,10 +7,19 @@
 #   • Single CSV with Phase column + capacity at every sample
 #####################################################################
 
+import csv
+import io
 import os
+import queue
 import sys
+import threading
 import time
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
+from typing import Optional
+
+import numpy as np
 
 import kbio.kbio_types as KBIO
 from kbio.c_utils import c_is_64b
@@ -38,6 +47,8 @@ cp5_tech_file  = rf"{binary_path}\cp5.ecc"
 
 # Output
 csv_path = "sequence.csv"
+bin_path = None      # e.g. "sequence.bin": compact full-rate (t, Ewe, Iwe) trace next to the CSV
+csv_every_s = None   # with bin_path set, keep only one CSV row per this many seconds
 
 # ---- Protocol setpoints (edit as needed) ----
 # PEIS (single-sine)
@@ -63,6 +74,10 @@ i_range_key  = "I_RANGE_1mA"  # or "I_RANGE_10mA" etc., depending on your cell
 
 # ==================================================
 
+# Derived once from the config above
+DLL_path     = os.path.join(binary_path, "EClib64.dll" if c_is_64b else "EClib.dll")
+i_range_val  = KBIO.I_RANGE[i_range_key].value
+
 def newline(): print()
 
 def print_exception(e):
@@ -98,6 +113,13 @@ class current_step:
     duration: float
     vs_init: bool = False
 
+@dataclass
+class IntegratorState:
+    """Capacity integration carried across every phase of the sequence."""
+    q_mAh: float = 0.0
+    last_t: Optional[float] = None
+    last_I: Optional[float] = None
+
 def build_cp_params(api, steps, repeat_count, record_dt=None, record_dE=None, i_range_name=None):
     """Build CP EccParams compatible with cp*.ecc using your working pattern."""
     p_list = []
@@ -116,13 +138,19 @@ def build_cp_params(api, steps, repeat_count, record_dt=None, record_dE=None, i_
     if record_dE is not None:
         p_list.append(make_ecc_parm(api, CP_parms["record_dE"], record_dE))
     if i_range_name:
-        p_list.append(make_ecc_parm(api, CP_parms["I_range"], KBIO.I_RANGE[i_range_name].value))
+        value = i_range_val if i_range_name == i_range_key else KBIO.I_RANGE[i_range_name].value
+        p_list.append(make_ecc_parm(api, CP_parms["I_range"], value))
 
     p_list.append(make_ecc_parm(api, CP_parms["repeat"], repeat_count))
     return make_ecc_parms(api, *p_list)
 
+@lru_cache(maxsize=None)
 def build_peis_params(api):
-    """Build PEIS EccParams (non-empty) with the standard fields."""
+    """Build PEIS EccParams (non-empty) with the standard fields.
+
+    The setpoints are fixed for the whole sequence, so the structure is built once and
+    reused by every PEIS phase.
+    """
     p_list = [
         make_ecc_parm(api, PEIS_parms["fi"], PEIS_fi_Hz),
         make_ecc_parm(api, PEIS_parms["ff"], PEIS_ff_Hz),
@@ -135,116 +163,286 @@ def build_peis_params(api):
     ]
     return make_ecc_parms(api, *p_list)
 
-def integrate_trap(prev_q_mAh, i_prev, i_cur, dt_s):
-    return prev_q_mAh + ((i_prev + i_cur) * 0.5 * dt_s) * 1000.0 / 3600.0
+def integrate_trap_batch(q0_mAh, last_t, last_I, ts, Is):
+    """Trapezoidal capacity after each sample of a batch, continuing from (last_t, last_I)."""
+    ts = np.asarray(ts, dtype=float)
+    Is = np.asarray(Is, dtype=float)
+    if last_t is None:
+        # very first sample: nothing to integrate against yet
+        last_t = ts[0]
+    if last_I is None:
+        last_I = Is[0]
+    t_prev = np.concatenate(([last_t], ts[:-1]))
+    i_prev = np.concatenate(([last_I], Is[:-1]))
+    dq = (i_prev + Is) * 0.5 * np.maximum(ts - t_prev, 0.0)
+    return q0_mAh + np.cumsum(dq) * 1000.0 / 3600.0
+
+# CSV columns; the header goes through the csv module, data rows are formatted by hand
+HEADER_TUPLE = ("Phase", "Time(s)", "Ewe(V)", "Iwe(A)", "Capacity(mAh)", "freq(Hz)", "Zre(Ohm)", "Zim(Ohm)")
+
+def csv_header_bytes(columns=HEADER_TUPLE):
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerow(columns)
+    return buf.getvalue().encode()
+
+# One CSV row: Phase,t_s,Ewe_V,I_A,Q_mAh,freq_Hz,Zre_Ohm,Zim_Ohm (t keeps more digits for long runs)
+_ROW_FMT = b"%s,%.9g,%.6g,%.6g,%.6g,%s,%s,%s\n"
+
+def _fmt(x):
+    """Optional CSV column: empty when the technique did not report it."""
+    return b"" if x is None else b"%.6g" % x
+
+# Per-technique sample unpacking: one C-level call per row instead of several dict .get calls
+_CC_FIELDS = itemgetter("t", "Ewe", "Iwe")
+_PEIS_FIELDS = itemgetter("t", "Ewe", "Iwe", "freq", "Zre", "Zim")
+
+def _cc_fields_lenient(out):
+    g = out.get
+    return g("t", 0.0), g("Ewe", 0.0), g("Iwe", 0.0)
+
+def _peis_fields_lenient(out):
+    g = out.get
+    return g("t", 0.0), g("Ewe", 0.0), g("Iwe", 0.0), g("freq"), g("Zre"), g("Zim")
+
+def extract_fields(batch, getter, fallback):
+    """Unpack every row of a batch with getter; if a row lacks a field, redo the batch with fallback."""
+    try:
+        return [getter(out) for out in batch]
+    except KeyError:
+        return [fallback(out) for out in batch]
 
-def run_peis(api, id_, ch, board_type, phase_name, csvf):
-    """Load + run PEIS; log every point; capacity integrates continuously."""
-    parms = build_peis_params(api)
-    api.LoadTechnique(id_, ch, peis_tech_file, parms, first=True, last=True, display=(verbosity>1))
-    api.StartChannel(id_, ch)
+class CsvWriter:
+    """Writes CSV bytes on a background thread so a slow disk never delays the next GetData.
+
+    The thread owns a raw file descriptor: whatever batches are queued when it wakes up are
+    coalesced into one buffer and written with a single os.write, so a backlog drains in a
+    few large writes instead of one per poll. The queue is bounded: if the disk falls far
+    behind, the poll loop blocks instead of buffering without limit.
+    """
 
-    # We’ll integrate capacity across the whole run; carry state in outer scope via closure
-    run_peis.q_mAh = getattr(run_peis, "q_mAh", 0.0)
-    run_peis.last_t = getattr(run_peis, "last_t", None)
-    run_peis.last_I = getattr(run_peis, "last_I", None)
+    def __init__(self, path, maxsize=64, chunk_size=64 * 1024):
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        self.fd = os.open(path, flags, 0o644)
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.chunk_size = chunk_size
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="csv-writer", daemon=True)
+        self.thread.start()
+
+    def _write_all(self, data):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+
+    def _run(self):
+        buf = bytearray()  # reused for every write
+        done = False
+        while not done:
+            item = self.queue.get()
+            sync = False
+            # coalesce everything already queued, up to about chunk_size
+            while item is not None:
+                data, item_sync = item
+                buf += data
+                sync = sync or item_sync
+                if len(buf) >= self.chunk_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if item is None:
+                done = True
+            if self.error is not None:
+                buf.clear()
+                continue  # keep draining so the poll loop never blocks on a dead writer
+            try:
+                if buf:
+                    self._write_all(buf)
+                    buf.clear()
+                if sync:
+                    os.fsync(self.fd)
+            except Exception as e:
+                self.error = e
+                buf = bytearray()  # e's traceback still holds a view of the old one
+
+    def write(self, data, sync=False):
+        if self.error is not None:
+            raise self.error
+        self.queue.put((data, sync))
+
+    def close(self):
+        """Drain pending rows, stop the thread and close the file."""
+        self.queue.put(None)
+        self.thread.join()
+        os.close(self.fd)
+        if self.error is not None:
+            raise self.error
+
+# Binary trace: magic, then one '<iff' record per sample (12 bytes instead of ~60 of CSV text)
+_TRACE_MAGIC = b"BLTRACE1"
+_TRACE_DTYPE = np.dtype([("dt_ms", "<i4"), ("Ewe", "<f4"), ("Iwe", "<f4")])
+
+class BinaryTrace:
+    """Full-rate sidecar of the sequence: time as delta-encoded integer milliseconds,
+    Ewe/Iwe as float32.
+
+    Timestamps are quantized to whole ms before differencing, so rounding never accumulates;
+    the absolute time is the running sum of dt_ms. Deltas are signed because the instrument
+    clock restarts with every technique, which shows up as a negative step.
+    """
 
-    print(f"> [{phase_name}] Reading data ", end="", flush=True)
-    while True:
-        data = api.GetData(id_, ch)
-        status, tech_name = get_info_data(api, data)
-        print(".", end="", flush=True)
+    def __init__(self, writer):
+        self.writer = writer
+        self.last_ms = 0
+        writer.write(_TRACE_MAGIC)
 
-        for out in get_experiment_data(api, data, tech_name, board_type):
-            t  = out.get("t", 0.0)
-            Ew = out.get("Ewe", 0.0)
-            Iw = out.get("Iwe", 0.0)
+    def append(self, ts, Ews, Iws, sync=False):
+        ms = np.rint(np.asarray(ts, dtype=float) * 1000.0).astype(np.int64)
+        rec = np.empty(len(ms), dtype=_TRACE_DTYPE)
+        rec["dt_ms"] = np.diff(ms, prepend=self.last_ms)
+        rec["Ewe"] = Ews
+        rec["Iwe"] = Iws
+        self.last_ms = int(ms[-1])
+        self.writer.write(rec.tobytes(), sync)
 
-            if run_peis.last_t is None:
-                dt = 0.0
-            else:
-                dt = max(0.0, t - run_peis.last_t)
-            i_prev = Iw if run_peis.last_I is None else run_peis.last_I
-            run_peis.q_mAh = integrate_trap(run_peis.q_mAh, i_prev, Iw, dt)
-            run_peis.last_t, run_peis.last_I = t, Iw
-
-            # Write row (include freq/Z if present)
-            freq = out.get("freq")
-            zre  = out.get("Zre")
-            zim  = out.get("Zim")
-            csvf.write(f"{phase_name},{t},{Ew},{Iw},{run_peis.q_mAh}")
-            if freq is not None: csvf.write(f",{freq}")
-            else:                 csvf.write(",")
-            if zre  is not None: csvf.write(f",{zre}")
-            else:                 csvf.write(",")
-            if zim  is not None: csvf.write(f",{zim}")
-            else:                 csvf.write(",")
-            csvf.write("\n")
+    def sync(self):
+        """Force everything appended so far to disk."""
+        self.writer.write(b"", True)
 
-        if status == "STOP":
-            print()  # newline after dots
-            break
+    def close(self):
+        self.writer.close()
 
-        time.sleep(0.2)
+def flush_rows(csvf, rows, sync=False):
+    """Hand the poll's row buffer to the writer in one piece; with sync, also force it to disk.
 
-def run_cc_with_vcut(api, id_, ch, board_type, phase_name, I_A, vcut, tech_file, csvf):
+    rows is a bytearray reused for the whole phase: it is copied out and cleared, not reallocated.
     """
-    Run a *single-step* constant-current using cp*.ecc and stop at software voltage limit.
+    if rows or sync:
+        csvf.write(bytes(rows), sync)
+        rows.clear()
+
+def next_poll_delay(sleep_s, got_samples, min_s, max_s=1.0):
+    """Adaptive GetData period: back to min_s when samples arrived, else double up to max_s."""
+    return min_s if got_samples else min(sleep_s * 2, max_s)
+
+def _acquire(api, id_, ch, board_type, phase_name, csvf, state, extract, extract_lenient,
+             min_sleep_s, vcut=None, trace=None):
+    """Shared GetData loop for every phase: log each point, integrate capacity, and
+    stop the channel at the software voltage cutoff when vcut is given.
+
+    extract returns (t, Ewe, Iwe, *extra) for one record; extra fills freq/Zre/Zim.
+    With a BinaryTrace, every sample goes to the trace and the CSV can be thinned to
+    checkpoint rows (csv_every_s).
     """
-    steps = [current_step(I_A, cp_step_dur_s, False)]  # one long step; software will stop sooner
-    parms = build_cp_params(api, steps, repeat_count=1, record_dt=record_dt_s, record_dE=record_dE_V, i_range_name=i_range_key)
-    api.LoadTechnique(id_, ch, tech_file, parms, first=True, last=True, display=(verbosity>1))
-    api.StartChannel(id_, ch)
+    rows = bytearray()  # CSV bytes for the current poll, written in one call
+    phase_b = phase_name.encode()
+    sleep_s = min_sleep_s
+    thin_csv = trace is not None and bool(csv_every_s)
+    csv_bucket = np.nan  # checkpoint bucket of the last CSV row; the phase's first row is always kept
 
-    # carry capacity integration state across entire run
-    run_cc_with_vcut.q_mAh = getattr(run_cc_with_vcut, "q_mAh", getattr(run_peis, "q_mAh", 0.0))
-    run_cc_with_vcut.last_t = getattr(run_cc_with_vcut, "last_t", getattr(run_peis, "last_t", None))
-    run_cc_with_vcut.last_I = getattr(run_cc_with_vcut, "last_I", getattr(run_peis, "last_I", None))
+    # hot references, resolved once instead of on every poll/sample
+    _get, _info, _exp = api.GetData, get_info_data, get_experiment_data
+    _add, _sleep = rows.extend, time.sleep
 
     print(f"> [{phase_name}] Reading data ", end="", flush=True)
     while True:
-        data = api.GetData(id_, ch)
-        status, tech_name = get_info_data(api, data)
+        data = _get(id_, ch)
+        status, tech_name = _info(api, data)
         print(".", end="", flush=True)
 
-        for out in get_experiment_data(api, data, tech_name, board_type):
-            t  = out.get("t", 0.0)
-            Ew = out.get("Ewe", 0.0)
-            Iw = out.get("Iwe", 0.0)
-
-            if run_cc_with_vcut.last_t is None:
-                dt = 0.0
+        batch = list(_exp(api, data, tech_name, board_type))
+        near_cut = False
+        if batch:
+            fields = extract_fields(batch, extract, extract_lenient)
+            ts, Ews, Iws = tuple(zip(*fields))[:3]
+
+            # capacity after every sample of the batch, in one vectorized pass
+            qs = integrate_trap_batch(state.q_mAh, state.last_t, state.last_I, ts, Iws).tolist()
+
+            # software cutoff, checked for the whole batch at once; rows stop at the crossing sample
+            cut = -1
+            if vcut is not None:
+                V, I = np.asarray(Ews), np.asarray(Iws)
+                hit = ((I > 0) & (V >= vcut)) | ((I < 0) & (V <= vcut))
+                if hit.any():
+                    cut = int(hit.argmax())
+                near_cut = abs(Ews[-1] - vcut) < 0.05
+            n = cut + 1 if cut >= 0 else len(ts)
+
+            if trace is not None:
+                trace.append(ts[:n], Ews[:n], Iws[:n], sync=cut >= 0)
+
+            if thin_csv:
+                # first sample of each csv_every_s window, plus the cutoff sample
+                buckets = np.floor_divide(ts[:n], csv_every_s)
+                keep = np.flatnonzero(np.diff(buckets, prepend=csv_bucket) != 0).tolist()
+                if cut >= 0 and (not keep or keep[-1] != cut):
+                    keep.append(cut)
+                csv_bucket = buckets[-1]
+                selected = [(fields[i], qs[i]) for i in keep]
             else:
-                dt = max(0.0, t - run_cc_with_vcut.last_t)
-            i_prev = Iw if run_cc_with_vcut.last_I is None else run_cc_with_vcut.last_I
-            run_cc_with_vcut.q_mAh = integrate_trap(run_cc_with_vcut.q_mAh, i_prev, Iw, dt)
-            run_cc_with_vcut.last_t, run_cc_with_vcut.last_I = t, Iw
+                selected = zip(fields[:n], qs)
 
-            # write CSV row (no Z during CC)
-            csvf.write(f"{phase_name},{t},{Ew},{Iw},{run_cc_with_vcut.q_mAh},,,\n")
+            pad = (b"",) * (6 - len(fields[0]))  # columns this technique does not report
+            for (t, Ew, Iw, *extra), q in selected:
+                _add(_ROW_FMT % (phase_b, t, Ew, Iw, q, *map(_fmt, extra), *pad))
 
-            # software cutoff
-            if (Iw > 0 and Ew >= vcut) or (Iw < 0 and Ew <= vcut):
+            state.q_mAh = qs[n - 1]
+            state.last_t, state.last_I = ts[n - 1], Iws[n - 1]
+
+            if cut >= 0:
+                flush_rows(csvf, rows, sync=True)
                 print(f"\n> [{phase_name}] Reached cutoff {vcut:.3f} V → stopping channel")
                 api.StopChannel(id_, ch)
                 return
 
         if status == "STOP":
-            print()  # newline
+            flush_rows(csvf, rows, sync=True)
+            if trace is not None:
+                trace.sync()  # even when this last poll brought no samples
+            print()  # newline after dots
             break
 
-        time.sleep(0.2)
+        # samples count even when csv_every_s kept none of them for the CSV
+        got_samples = bool(batch)
+        flush_rows(csvf, rows)
+
+        sleep_s = next_poll_delay(sleep_s, got_samples, min_sleep_s)
+        if near_cut:
+            # close to the cutoff: poll at the fastest rate so we don't overshoot it
+            sleep_s = min_sleep_s
+        _sleep(sleep_s)
+
+def run_peis(api, id_, ch, board_type, phase_name, csvf, state, trace=None):
+    """Load + run PEIS; log every point; capacity integrates continuously."""
+    parms = build_peis_params(api)
+    api.LoadTechnique(id_, ch, peis_tech_file, parms, first=True, last=True, display=(verbosity>1))
+    api.StartChannel(id_, ch)
+
+    # PEIS has no record period; poll briskly while points arrive
+    _acquire(api, id_, ch, board_type, phase_name, csvf, state,
+             _PEIS_FIELDS, _peis_fields_lenient, min_sleep_s=0.05, trace=trace)
+
+def run_cc_with_vcut(api, id_, ch, board_type, phase_name, I_A, vcut, tech_file, csvf, state, trace=None):
+    """
+    Run a *single-step* constant-current using cp*.ecc and stop at software voltage limit.
+    """
+    steps = [current_step(I_A, cp_step_dur_s, False)]  # one long step; software will stop sooner
+    parms = build_cp_params(api, steps, repeat_count=1, record_dt=record_dt_s, record_dE=record_dE_V, i_range_name=i_range_key)
+    api.LoadTechnique(id_, ch, tech_file, parms, first=True, last=True, display=(verbosity>1))
+    api.StartChannel(id_, ch)
+
+    _acquire(api, id_, ch, board_type, phase_name, csvf, state,
+             _CC_FIELDS, _cc_fields_lenient, min_sleep_s=min(max(record_dt_s / 4, 0.02), 0.2), vcut=vcut, trace=trace)
 
 # =============================== MAIN ===============================
 try:
     newline()
 
-    # Pick DLL
-    DLL_file = "EClib64.dll" if c_is_64b else "EClib.dll"
-    DLL_path = f"{binary_path}{os.sep}{DLL_file}"
-
-    # API
+    # API (DLL picked at import from binary_path and the interpreter bitness)
     api = KBIO_api(DLL_path)
+    channel_map = api.channel_map({channel})  # fixed channel: built once
 
     # Library version
     version = api.GetLibVersion()
@@ -271,7 +469,6 @@ try:
 
     # Load firmware (as in your working demo)
     print(f"> Loading {firmware_path} ...")
-    channel_map = api.channel_map({channel})
     api.LoadFirmware(id_, channel_map, firmware=firmware_path, fpga=fpga_path, force=force_load_firmware)
     print("> ... firmware loaded")
     newline()
@@ -292,32 +489,38 @@ try:
     if not os.path.isfile(tech_file):
         raise FileNotFoundError(f"Missing CP technique file for this board: {tech_file}")
 
-    # Open CSV
-    csvfile = open(csv_path, "w", buffering=1)  # line-buffer
-    csvfile.write("Phase,Time(s),Ewe(V),Iwe(A),Capacity(mAh),freq(Hz),Zre(Ohm),Zim(Ohm)\n")
+    # Open CSV; rows are batched per poll and written by a background thread
+    csvfile = CsvWriter(csv_path)
+    csvfile.write(csv_header_bytes())
+    trace = BinaryTrace(CsvWriter(bin_path)) if bin_path else None
 
     # --------- SEQUENCE ---------
+    state = IntegratorState()  # capacity carries over from one phase to the next
+
     # 1) PEIS 1 @ OCV
-    run_peis(api, id_, channel, board_type, "PEIS 1", csvfile)
+    run_peis(api, id_, channel, board_type, "PEIS 1", csvfile, state, trace=trace)
 
     # 2) Constant-current Charge to Vmax (software cut)
-    run_cc_with_vcut(api, id_, channel, board_type, "CC Charge", I_charge_A, Vmax_cut_V, tech_file, csvfile)
+    run_cc_with_vcut(api, id_, channel, board_type, "CC Charge", I_charge_A, Vmax_cut_V, tech_file, csvfile, state, trace=trace)
 
     # 3) PEIS 2 (top-of-charge)
-    run_peis(api, id_, channel, board_type, "PEIS 2", csvfile)
+    run_peis(api, id_, channel, board_type, "PEIS 2", csvfile, state, trace=trace)
 
     # 4) Constant-current Discharge to Vmin (software cut)
-    run_cc_with_vcut(api, id_, channel, board_type, "CC Discharge", I_discharge_A, Vmin_cut_V, tech_file, csvfile)
+    run_cc_with_vcut(api, id_, channel, board_type, "CC Discharge", I_discharge_A, Vmin_cut_V, tech_file, csvfile, state, trace=trace)
 
     # 5) PEIS 3 (after discharge)
-    run_peis(api, id_, channel, board_type, "PEIS 3", csvfile)
+    run_peis(api, id_, channel, board_type, "PEIS 3", csvfile, state, trace=trace)
 
     # 6) Loop pairs (charge→discharge)
     for cyc in range(1, loop_pairs + 1):
-        run_cc_with_vcut(api, id_, channel, board_type, f"Loop Charge {cyc}", +I_loop_A, Vmax_cut_V, tech_file, csvfile)
-        run_cc_with_vcut(api, id_, channel, board_type, f"Loop Disch {cyc}",  -I_loop_A, Vmin_cut_V, tech_file, csvfile)
+        run_cc_with_vcut(api, id_, channel, board_type, f"Loop Charge {cyc}", +I_loop_A, Vmax_cut_V, tech_file, csvfile, state, trace=trace)
+        run_cc_with_vcut(api, id_, channel, board_type, f"Loop Disch {cyc}",  -I_loop_A, Vmin_cut_V, tech_file, csvfile, state, trace=trace)
 
     csvfile.close()
+    if trace is not None:
+        trace.close()
+        print(f"\n> Full-rate trace saved to {bin_path}")
     print(f"\n> Sequence done. Data saved to {csv_path}")
 
     # Disconnect
@@ -327,12 +530,16 @@ except KeyboardInterrupt:
     print(".. interrupted")
     try:
         csvfile.close()
+        if trace is not None:
+            trace.close()
     except Exception:
         pass
 
 except Exception as e:
     try:
         csvfile.close()
+        if trace is not None:
+            trace.close()
     except Exception:
         pass
     print_exception(e)
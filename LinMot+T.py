@@ -2,301 +2,233 @@
 
 from __future__ import annotations
 
-import clr
+import atexit
+import functools
 import time
 import csv
+import json
 import os
+import struct
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import ctypes
 import platform
-from contextlib import AbstractContextManager
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 from typing import Optional
-from ctypes import byref, c_int16, c_int32, c_float, c_char, POINTER
-
-
-class LinMotForceController:
-    def __init__(self, dll_path, target_ip, target_port="49360", host_ip="192.109.209.100", host_port="41136"):
-        clr.AddReference(dll_path) # type: ignore
-        import LinUDP # type: ignore
-        self.LinUDP = LinUDP
-        self.target_ip = target_ip
-        self.target_port = target_port
-        self.host_ip = host_ip
-        self.host_port = host_port
-        self.ACI = LinUDP.ACI()
-        self.connected = False
-
-    def __enter__(self) -> "LinMotForceController":  # type: ignore[override]
-        if not self.connect():
-            raise RuntimeError("Failed to connect to LinMot")
-        return self
 
-    def __exit__(self, exc_type, exc, tb) -> Optional[bool]:  # type: ignore[override]
-        self.disconnect()
-        return False
-
-    def connect(self):
-        self.ACI.ClearTargetAddressList()
-        self.ACI.SetTargetAddressList(self.target_ip, self.target_port)
-        self.ACI.ActivateConnection(self.host_ip, self.host_port)
-        self.connected = self.ACI.isConnected(self.target_ip)
-        return self.connected
-
-    def _get_state(self):
-        return self.ACI.getStateMachineState(self.target_ip)
-
-    def _pretty_state(self, st=None):
-        st = st if st is not None else self._get_state()
-        try:
-            return f"{st} ({int(st)})"
-        except Exception:
-            return str(st)
-
-    def ensure_drive_ready_for_motion(self, timeout=30):
-        """Simple, reliable bring-up: ack errors, call SwitchOn(), wait for OperationEnabled."""
-        if self.ACI.isError(self.target_ip):
-            print("Acknowledging errors...")
-            self.ACI.AckErrors(self.target_ip)
-            time.sleep(0.2)
-
-        print(f"Initial drive state: {self._pretty_state()}")
-
-        t0 = time.time()
-        if not self.ACI.isHomed(self.target_ip):
-            print("Drive is not homed. Calling Homing()...")
-            if not self.ACI.Homing(self.target_ip):
-                raise RuntimeError("Homing() call failed.")
-            print("Waiting for homing to complete...")
-
-        print("Drive is Operation Enabled.")
-
-    def set_force(self, force_n):
-        return self.ACI.LMfc_ChangeTargetForce(self.target_ip, float(force_n))
-
-    def stop_force(self):
-        return self.set_force(0.0)
-
-    def disconnect(self):
-        self.ACI.CloseConnection()
-        self.connected = False
-
-    def ensure_force_control_ready(
-            self,
-            position_mm: float,
-            velocity: float = 0.1,
-            acceleration: float = 0.2,
-            force_limit_n: float = 20.0,
-            target_force_n: float = 200.0,
-            reset_if_needed: bool = True
-    ) -> bool:
-        """Ensure the drive is in a valid state for force control."""
-        print("Checking force control readiness...")
-
-        if self.ACI.isError(self.target_ip):
-            error_txt = self.ACI.LMcf_GetErrorTxt(self.target_ip)
-            raise RuntimeError(f"Drive error: {error_txt}")
-
-        if self.ACI.isSpecialMotionActive(self.target_ip):
-            print("Drive is already in special motion (likely force control).")
-            print(f"Updating target force to {target_force_n} N...")
-            self.ACI.LMfc_ChangeTargetForce(self.target_ip, float(target_force_n))
-            return True
-
-        if not reset_if_needed:
-            print("Force control is not active and reset_if_needed is False — skipping reset.")
-            return False
-
-        print("Resetting force control state before reapplying...")
-        self.ACI.LMfc_GoToPosRstForceCtrlSetI(
-            self.target_ip,
-            float(position_mm - 1),
-            float(velocity),
-            float(acceleration),
-            float(acceleration),
-        )
-        time.sleep(0.2)
-
-        print(f"Starting force control to position {position_mm} mm with {target_force_n} N...")
-        success = self.ACI.LMfc_IncrementActPosWithHigherForceCtrlLimitAndTargetForce(
-            self.target_ip,
-            float(position_mm),
-            float(velocity),
-            float(acceleration),
-            float(force_limit_n),
-            float(target_force_n),
-        )
-        return success
-
-    def get_motor_data(self):
-        """Get current motor data (force, current, position)."""
-        force = self.ACI.getMonitoringChannelWithTimestamp(self.target_ip, 2)
-        current = self.ACI.getMonitoringChannelWithTimestamp(self.target_ip, 3)
-        position = self.ACI.getMonitoringChannelWithTimestamp(self.target_ip, 4)
-
-        return {
-            'force_raw': force.value,
-            'current_raw': current.value,
-            'position_raw': position.value
-        }
-
-    def move_abs(self,
-        position_mm: float,
-        max_velocity: float,
-        acceleration: float,
-        deceleration: float,
-    ) -> bool:
-        return self.ACI.LMmt_MoveAbs(
-            self.target_ip,
-            float(position_mm),
-            float(max_velocity),
-            float(acceleration),
-            float(deceleration),
-        )
-
-
-# Direct DLL interface for TC-08
-class DirectTC08:
-    def __init__(self, dll_path=r"C:\Program Files (x86)\PicoLog\usbtc08.dll"):
-        os.add_dll_directory(os.path.dirname(dll_path))
-        self.dll = ctypes.WinDLL(dll_path)
-        self._setup_function_prototypes()
-
-    def _setup_function_prototypes(self):
-        self.dll.usb_tc08_open_unit.restype = c_int16
-        self.dll.usb_tc08_open_unit.argtypes = []
-
-        self.dll.usb_tc08_close_unit.restype = c_int16
-        self.dll.usb_tc08_close_unit.argtypes = [c_int16]
-
-        self.dll.usb_tc08_set_mains.restype = c_int16
-        self.dll.usb_tc08_set_mains.argtypes = [c_int16, c_int16]
-
-        self.dll.usb_tc08_set_channel.restype = c_int16
-        self.dll.usb_tc08_set_channel.argtypes = [c_int16, c_int16, c_char]
-
-        self.dll.usb_tc08_get_single.restype = c_int16
-        self.dll.usb_tc08_get_single.argtypes = [c_int16, POINTER(c_float), POINTER(c_int16), c_int16]
-
-        self.dll.usb_tc08_get_last_error.restype = c_int16
-        self.dll.usb_tc08_get_last_error.argtypes = [c_int16]
-
-
-class TC08Reader:
-    USBTC08_UNITS_C = 0  # Celsius
-    USBTC08_UNITS_F = 1  # Fahrenheit
-    USBTC08_UNITS_K = 2  # Kelvin
-    USBTC08_UNITS_R = 3  # Rankine
-
-    def __init__(self, channels=(1,), tc_type='K', mains_hz=60):
-        self.tc08 = DirectTC08()
-        self.channels = sorted(set(channels))
-        self.tc_type_code = ord(tc_type.upper())
-        self.mains_hz = 60 if mains_hz not in (50, 60) else mains_hz
-        self.handle = c_int16(0)
-
-    def open(self):
-        """Open connection to TC-08 unit"""
-        self.handle = c_int16(self.tc08.dll.usb_tc08_open_unit())
-
-        if self.handle.value <= 0:
-            error_code = self.tc08.dll.usb_tc08_get_last_error(c_int16(0))
-            raise RuntimeError(f"TC-08 not found or driver issue. Error code: {error_code}")
-
-        mains_setting = 1 if self.mains_hz == 60 else 0
-        result = self.tc08.dll.usb_tc08_set_mains(self.handle, c_int16(mains_setting))
-        if result == 0:
-            raise RuntimeError("Failed to set mains frequency")
-
-        self.tc08.dll.usb_tc08_set_channel(self.handle, c_int16(0), c_char(ord(' ')))
-
-        for ch in self.channels:
-            result = self.tc08.dll.usb_tc08_set_channel(self.handle, c_int16(ch), c_char(self.tc_type_code))
-            if result == 0:
-                raise RuntimeError(f"Failed to configure channel {ch}")
-
-        print(f"TC-08 opened successfully with handle {self.handle.value}")
-
-    def close(self):
-        """Close connection to TC-08 unit"""
-        if self.handle.value > 0:
-            self.tc08.dll.usb_tc08_close_unit(self.handle)
-            self.handle = c_int16(0)
-            print("TC-08 closed")
-
-    def get_single(self, units=USBTC08_UNITS_C):
-        """Get single temperature readings from all configured channels"""
-        if self.handle.value <= 0:
-            raise RuntimeError("TC-08 not open")
-
-        temps = (c_float * 9)()
-        overflow = c_int16(0)
-
-        result = self.tc08.dll.usb_tc08_get_single(
-            self.handle,
-            temps,
-            byref(overflow),
-            c_int16(units)
-        )
-
-        if result == 0:
-            error_code = self.tc08.dll.usb_tc08_get_last_error(self.handle)
-            raise RuntimeError(f"Failed to get readings. Error code: {error_code}")
-
-        readings = {}
-        readings['cold_junction'] = float(temps[0])
-
-        for ch in self.channels:
-            readings[f'channel_{ch}'] = float(temps[ch])
+from linmot_driver import LinMotForceController
+from tc08_driver import TC08Reader
+
+
+@contextmanager
+def _high_priority(core=None):
+    """Run the calling thread at high priority for the duration of the block (Windows only).
+
+    Raises the process to HIGH_PRIORITY_CLASS and the thread to THREAD_PRIORITY_HIGHEST,
+    optionally pins the thread to one core, and requests a 1 ms system timer so
+    time.sleep wakes up close to its deadline. Everything is restored on exit.
+    """
+    if platform.system() != "Windows":
+        yield
+        return
+
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL("kernel32")
+    winmm = ctypes.WinDLL("winmm")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    kernel32.GetCurrentThread.restype = wintypes.HANDLE
+    kernel32.GetPriorityClass.argtypes = [wintypes.HANDLE]
+    kernel32.GetPriorityClass.restype = wintypes.DWORD
+    kernel32.SetPriorityClass.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    kernel32.GetThreadPriority.argtypes = [wintypes.HANDLE]
+    kernel32.SetThreadPriority.argtypes = [wintypes.HANDLE, ctypes.c_int]
+    kernel32.SetThreadAffinityMask.argtypes = [wintypes.HANDLE, ctypes.c_size_t]
+    kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+
+    HIGH_PRIORITY_CLASS = 0x00000080
+    THREAD_PRIORITY_HIGHEST = 2
+
+    process, thread = kernel32.GetCurrentProcess(), kernel32.GetCurrentThread()
+    old_class = kernel32.GetPriorityClass(process)
+    old_priority = kernel32.GetThreadPriority(thread)
+    kernel32.SetPriorityClass(process, HIGH_PRIORITY_CLASS)
+    kernel32.SetThreadPriority(thread, THREAD_PRIORITY_HIGHEST)
+    old_mask = kernel32.SetThreadAffinityMask(thread, 1 << core) if core is not None else 0
+    winmm.timeBeginPeriod(1)
+    try:
+        yield
+    finally:
+        winmm.timeEndPeriod(1)
+        if old_mask:
+            kernel32.SetThreadAffinityMask(thread, old_mask)
+        kernel32.SetThreadPriority(thread, old_priority)
+        if old_class:
+            kernel32.SetPriorityClass(process, old_class)
 
-        if overflow.value != 0:
-            overflow_channels = []
-            for i in range(9):
-                if overflow.value & (1 << i):
-                    overflow_channels.append(i)
-            print(f"Warning: Overflow detected on channels: {overflow_channels}")
 
-        return readings
+def _config_key(config):
+    """Hashable form of a config dict (lists become tuples) for the device caches."""
+    return tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in config.items()))
 
-    def __enter__(self):
-        self.open()
-        return self
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
+@functools.lru_cache(maxsize=1)
+def _get_linmot(config_key):
+    """LinMot controller shared by every run in this process; disconnected at exit.
+
+    Loading LinUDP.dll through the CLR and opening the UDP connection is the slow
+    part of starting a run, so it happens once per configuration.
+    """
+    linmot = LinMotForceController(**dict(config_key))
+    linmot.__enter__()
+    atexit.register(linmot.disconnect)
+    return linmot
+
+
+@functools.lru_cache(maxsize=1)
+def _get_tc08(config_key):
+    """TC-08 reader shared by every run in this process; closed at exit.
+
+    usb_tc08_open_unit takes seconds, so the unit stays open between runs.
+    """
+    temp_sensor = TC08Reader(**dict(config_key))
+    temp_sensor.__enter__()
+    atexit.register(temp_sensor.close)
+    return temp_sensor
 
 
 class CombinedDataLogger:
     """Combined data logger for LinMot and temperature sensors."""
 
-    def __init__(self, linmot_config, temp_config):
+    def __init__(self, linmot_config, temp_config, motor_poll_s: Optional[float] = None,
+                 keep_open: bool = False):
         self.linmot_config = linmot_config
         self.temp_config = temp_config
+        # Opt-in background LinMot read period (a thread of ACI calls competing with the
+        # sampler); None, the default, reads the drive once per sample
+        self.motor_poll_s = motor_poll_s
+        # Share the drive connection and TC-08 handle with later loggers in this process
+        # (see _get_linmot/_get_tc08) instead of closing them on exit
+        self.keep_open = keep_open
         self.linmot = None
         self.temp_sensor = None
+        self._pool = None
 
     def __enter__(self):
         # Initialize LinMot controller
-        self.linmot = LinMotForceController(**self.linmot_config)
-        self.linmot.__enter__()
+        if self.keep_open:
+            self.linmot = _get_linmot(_config_key(self.linmot_config))
+            if not self.linmot.connected:
+                self.linmot.__enter__()
+        else:
+            self.linmot = LinMotForceController(**self.linmot_config)
+            self.linmot.__enter__()
+        if self.motor_poll_s:
+            self.linmot.start_monitoring(self.motor_poll_s)
 
         # Initialize temperature sensor
-        self.temp_sensor = TC08Reader(**self.temp_config)
-        self.temp_sensor.__enter__()
+        if self.keep_open:
+            self.temp_sensor = _get_tc08(_config_key(self.temp_config))
+            if self.temp_sensor.handle.value <= 0:
+                self.temp_sensor.__enter__()
+        else:
+            self.temp_sensor = TC08Reader(**self.temp_config)
+            self.temp_sensor.__enter__()
+
+        # Worker for the blocking TC-08 read, so it overlaps the LinMot UDP round-trips
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tc08")
 
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._pool:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        if self.keep_open:
+            # The cached devices stay open for the next run; atexit closes them
+            if self.linmot:
+                self.linmot.stop_monitoring()
+            return
         if self.linmot:
             self.linmot.__exit__(exc_type, exc_val, exc_tb)
         if self.temp_sensor:
             self.temp_sensor.__exit__(exc_type, exc_val, exc_tb)
 
+    @staticmethod
+    def _csv_writer_loop(f, encode, rows, batch_size, flush_interval_s, fsync_every, errors):
+        """Drain sampled rows from the queue into the output file until a None sentinel arrives.
+
+        Rows are taken in batches of up to batch_size, turned into one str or bytes
+        object per batch by encode(batch) and written with a single call; the
+        file is flushed and fsynced every fsync_every batches or flush_interval_s seconds.
+        A write error is recorded in errors and the queue keeps being drained, so the
+        sampling thread never blocks on a dead writer.
+        """
+        batch = []
+        batches_since_sync = 0
+        last_sync = time.time()
+        done = False
+        while not done:
+            try:
+                row = rows.get(timeout=flush_interval_s)
+                while row is not None:
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        break
+                    row = rows.get_nowait()
+                done = row is None
+            except queue.Empty:
+                pass
+
+            if errors:
+                batch.clear()
+                continue
+            try:
+                if batch:
+                    f.write(encode(batch))
+                    batch.clear()
+                    batches_since_sync += 1
+                now = time.time()
+                if done or batches_since_sync >= fsync_every or now - last_sync >= flush_interval_s:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    batches_since_sync = 0
+                    last_sync = now
+            except Exception as e:
+                errors.append(e)
+
     def record_combined_data(
         self,
         duration_s: int = 20,
         interval_s: float = 0.1,
         csv_path: str = "combined_data.csv",
+        batch_size: int = 256,
+        flush_interval_s: float = 5.0,
+        fsync_every: int = 4,
+        buffer_s: float = 10.0,
+        binary: bool = False,
+        high_priority: bool = True,
+        pin_core: Optional[int] = None,
     ) -> None:
-        """Log force, current, position, and temperature data to a single CSV file."""
+        """Log force, current, position, and temperature data to a single CSV file.
+
+        Sampling runs on the calling thread and only enqueues rows; a writer thread drains
+        them into the CSV (see _csv_writer_loop), so a slow disk does not delay the next
+        sample. The queue holds about buffer_s seconds of samples before sampling waits.
+        The loop runs until duration_s has elapsed, so memory use does not depend on it.
+
+        With binary=True, csv_path receives headerless little-endian fixed-size records
+        instead (int64 nanosecond times, int32 drive values, float32 temperatures) and the column
+        layout goes to csv_path + ".schema.json"; load it with
+        np.fromfile(csv_path, dtype=[tuple(c) for c in schema["dtype"]]).
+
+        high_priority raises the process and sampling-thread priority on Windows while
+        recording (see _high_priority); pin_core additionally pins the sampling thread.
+        """
+        if interval_s <= 0:
+            raise ValueError(f"interval_s must be positive, got {interval_s}")
+        if duration_s < interval_s:
+            raise ValueError(f"duration_s={duration_s} is shorter than one interval ({interval_s}s)")
 
         # Create header with descriptive temperature channel names
         header = ["system_time", "time_s", "force_raw", "current_raw", "position_raw", "cold_junction_temp"]
@@ -311,59 +243,141 @@ class CombinedDataLogger:
         print(f"Recording to: {csv_path}")
         print(f"Header: {header}")
 
-        with open(csv_path, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(header)
-
-            start = time.time()
-            num_samples = int(duration_s // interval_s)
-
-            for i in range(num_samples):
+        nch = len(self.temp_sensor.channels)
+        if binary:
+            # One packed record per row into a buffer reused for every batch
+            rec = struct.Struct("<qqiiif" + "f" * nch)
+            rec_buf = bytearray(rec.size * batch_size)
+
+            def encode(batch):
+                for j, row in enumerate(batch):
+                    rec.pack_into(rec_buf, j * rec.size, *row)
+                return memoryview(rec_buf)[:len(batch) * rec.size]
+
+            columns = ["system_time_ns", "time_ns", *header[2:]]
+            dtype = [(name, code) for name, code in zip(
+                columns, ["<i8", "<i8", "<i4", "<i4", "<i4", "<f4"] + ["<f4"] * nch)]
+            with open(csv_path + ".schema.json", "w") as schema_file:
+                json.dump({"struct": rec.format, "record_size": rec.size, "dtype": dtype},
+                          schema_file, indent=2)
+        else:
+            # Fixed schema, so rows skip the csv module: times to the microsecond, raw drive
+            # values as integers, temperatures to the TC-08 resolution; CRLF like csv.writer.
+            # Times arrive as integer ns and are split into seconds and microseconds
+            # exactly, so the precision does not depend on how large the timestamp is
+            row_fmt = "%d.%06d,%d.%06d,%d,%d,%d,%.3f" + ",%.3f" * nch + "\r\n"
+
+            def encode(batch):
+                return "".join([
+                    row_fmt % (*divmod(row[0] // 1000, 1000000), *divmod(row[1] // 1000, 1000000), *row[2:])
+                    for row in batch
+                ])
+
+        mode, newline = ("wb", None) if binary else ("w", "")
+        with open(csv_path, mode, newline=newline, buffering=4 * 1024 * 1024) as f:
+            if not binary:
+                csv.writer(f).writerow(header)
+
+            # Scheduling runs on the monotonic perf_counter; wall-clock time is only logged.
+            # Logged times are integer nanoseconds (time_ns/perf_counter_ns, same clocks)
+            start_ns = time.perf_counter_ns()
+            start = start_ns * 1e-9
+            # Deadlines are anchor + k * interval_s, computed from the sample count so that
+            # rounding does not build up over long runs; the anchor moves only on an overrun
+            anchor = start
+            k = 0
+            overruns = 0
+            end = start + duration_s
+            i = 0  # Samples taken so far
+
+            rows = queue.Queue(maxsize=max(batch_size, int(buffer_s / interval_s)))
+            writer_errors = []
+            writer_thread = threading.Thread(
+                target=self._csv_writer_loop,
+                args=(f, encode, rows, batch_size, flush_interval_s, fsync_every, writer_errors),
+                name="combined-csv-writer",
+                daemon=True,
+            )
+            writer_thread.start()
+
+            # Loop invariants, resolved once instead of on every sample
+            get_motor = self.linmot.get_motor_data
+            get_temp = self.temp_sensor.get_single
+            submit = self._pool.submit
+            put_row = rows.put
+            now, sleep = time.perf_counter, time.sleep
+            now_ns, wall_ns = time.perf_counter_ns, time.time_ns
+            units = TC08Reader.USBTC08_UNITS_C
+            # Scratch buffers refilled in place on every sample: [force, current, position]
+            # and [cold_junction, *channels]; only the row tuple handed to the writer is new
+            motor_buf = [0, 0, 0]
+            temp_buf = [0.0] * (1 + len(self.temp_sensor.channels))
+            channels = list(self.temp_sensor.channels)
+            cell_idx = 1 + channels.index(1) if 1 in channels else None
+            env_idx = 1 + channels.index(2) if 2 in channels else None
+            progress_every_s = 5.0
+            next_progress_ns = int(progress_every_s * 1e9)  # In elapsed nanoseconds
+
+            scheduling = _high_priority(pin_core) if high_priority else nullcontext()
+            with scheduling:
                 try:
-                    t_sys = time.time()
-                    t_elapsed = t_sys - start
-
-                    # Get motor data
-                    motor_data = self.linmot.get_motor_data()
-
-                    # Get temperature data
-                    temp_data = self.temp_sensor.get_single()
-
-                    # Prepare row data
-                    row = [
-                        t_sys,
-                        t_elapsed,
-                        motor_data['force_raw'],
-                        motor_data['current_raw'],
-                        motor_data['position_raw'],
-                        temp_data['cold_junction']
-                    ]
-
-                    # Add temperature channel data
-                    for ch in self.temp_sensor.channels:
-                        row.append(temp_data[f'channel_{ch}'])
-
-                    writer.writerow(row)
-
-                    # Progress indicator with both temperature channels
-                    if i % (num_samples // 10) == 0:  # Show progress every 10%
-                        progress = (i / num_samples) * 100
-                        cell_temp = temp_data.get('channel_1', 'N/A')
-                        env_temp = temp_data.get('channel_2', 'N/A')
-                        print(f"Progress: {progress:.1f}% - Force: {motor_data['force_raw']:.2f}, "
-                              f"Cell: {cell_temp:.2f}°C, Environment: {env_temp:.2f}°C")
-
-                    # Precise timing control
-                    elapsed = time.time() - start
-                    sleep_time = max(0, interval_s * (i + 1) - elapsed)
-                    time.sleep(sleep_time)
-
-                except Exception as e:
-                    print(f"Error during data collection at sample {i}: {e}")
-                    # Continue collecting data even if one sample fails
-                    continue
-
-        print(f"Data recording completed. {num_samples} samples saved to {csv_path}")
+                    while now() < end:
+                        if writer_errors:
+                            raise RuntimeError(f"CSV writer failed: {writer_errors[0]}")
+                        try:
+                            t_sys_ns = wall_ns()
+                            t_elapsed_ns = now_ns() - start_ns
+
+                            # Both reads block on I/O and release the GIL: start the TC-08
+                            # read on the worker and query LinMot meanwhile
+                            temp_future = submit(get_temp, units, temp_buf)
+                            try:
+                                get_motor(motor_buf)
+                            finally:
+                                temp_future.result()
+
+                            # Row data, temperature channels last
+                            put_row((t_sys_ns, t_elapsed_ns, *motor_buf, *temp_buf))
+
+                            # Progress indicator with both temperature channels, every few seconds
+                            if t_elapsed_ns >= next_progress_ns:
+                                next_progress_ns = t_elapsed_ns + int(progress_every_s * 1e9)
+                                progress = min(t_elapsed_ns * 1e-9 / duration_s, 1.0) * 100
+                                cell_temp = temp_buf[cell_idx] if cell_idx else float('nan')
+                                env_temp = temp_buf[env_idx] if env_idx else float('nan')
+                                print(f"Progress: {progress:.1f}% - Force: {motor_buf[0]:.2f}, "
+                                      f"Cell: {cell_temp:.2f}°C, Environment: {env_temp:.2f}°C")
+
+                        except Exception as e:
+                            print(f"Error during data collection at sample {i}: {e}")
+                            # Continue collecting data even if one sample fails
+                        i += 1
+
+                        # Absolute deadlines: sleep most of the way, then spin the last ~0.5 ms
+                        k += 1
+                        next_deadline = anchor + k * interval_s
+                        remaining = next_deadline - now()
+                        if remaining < 0:
+                            # This sample overran its slot: restart the schedule from now rather
+                            # than firing the missed samples back to back
+                            overruns += 1
+                            anchor, k = now(), 0
+                            continue
+                        if remaining > 1e-3:
+                            sleep(remaining - 5e-4)
+                        while now() < next_deadline:
+                            pass
+                finally:
+                    # Whatever is still queued, including after Ctrl+C, reaches the disk
+                    rows.put(None)
+                    writer_thread.join()
+
+            if writer_errors:
+                raise RuntimeError(f"CSV writer failed: {writer_errors[0]}")
+
+        print(f"Data recording completed. {i} samples saved to {csv_path}")
+        if overruns:
+            print(f"Warning: {overruns} samples took longer than the {interval_s}s interval")
 
 
 def main():
@@ -380,7 +394,8 @@ def main():
     TEMP_CONFIG = {
         'channels': [1, 2],  # Use channels 1 and 2
         'tc_type': 'K',      # K-type thermocouple
-        'mains_hz': 60       # 60Hz mains frequency
+        'mains_hz': 60,      # 60Hz mains frequency
+        'stream_interval_ms': 0,  # Stream at the fastest rate; reads no longer wait for a conversion
     }
 
     # Data logging parameters
@@ -16,6 +16,36 @@ BLFIND_PATH = r"C:/EC-Lab Development Package/lib/blfind.dll"
 BIOLOGIC_ADDRESS = "USB0"  # Or actual IP if using Ethernet
 
 CHANNEL = 1
+FORCE_EPSILON = 0.1  # N; smaller changes to the force target are not sent to the drive
+
+# Long-running menu actions run on one worker thread so the menu stays usable
+_task_thread = None
+_task_stop = threading.Event()
+
+
+def start_background(name, target, *args):
+    """Run target(*args, stop_event) on the worker thread unless a task is already running."""
+    global _task_thread
+    if task_running():
+        print(f"'{_task_thread.name}' is still running; stop it first (option 6)")
+        return
+    _task_stop.clear()
+    _task_thread = threading.Thread(target=target, args=(*args, _task_stop), name=name, daemon=True)
+    _task_thread.start()
+    print(f"'{name}' started in the background")
+
+
+def task_running():
+    return _task_thread is not None and _task_thread.is_alive()
+
+
+def stop_background(timeout=None):
+    """Ask the running task to stop and wait for it to finish."""
+    if not task_running():
+        print("No background task is running")
+        return
+    _task_stop.set()
+    _task_thread.join(timeout)
 
 def connect_devices():
     """Create controller instances and connect to hardware."""
@@ -48,8 +78,10 @@ def some_condition(data):
     return False
 
 
-def automated_sequence(linmot, bio):
-    """Run the predefined sequence of PEIS and GCPL steps."""
+def automated_sequence(linmot, bio, stop=None):
+    """Run the predefined sequence of PEIS and GCPL steps; stop (an Event) aborts it."""
+    if stop is None:
+        stop = threading.Event()
     try:
         available_channels = bio.get_plugged_channels()
         if CHANNEL not in available_channels:
@@ -80,7 +112,12 @@ def automated_sequence(linmot, bio):
             bio.start_channel(CHANNEL)
             # Placeholder polling loop
             for _ in range(int(params.get('duration', 0))):
-                time.sleep(1)
+                if stop.wait(1):
+                    break
+            if stop.is_set():
+                bio.stop_channel(CHANNEL)
+                print(f"Sequence stopped during step {step}.")
+                break
             print(f"Step {step} completed.")
 
         linmot.stop_force()
@@ -93,22 +130,33 @@ def run_gcpl(bio):
     current = float(input("GCPL current (A): "))
     duration = float(input("Duration (s): "))
     voltage_limit = float(input("Voltage limit (V): "))
+    start_background("GCPL", _gcpl_loop, bio, current, duration, voltage_limit)
+
+
+def _gcpl_loop(bio, current, duration, voltage_limit, stop):
     file_name = f"gcpl_{int(time.time())}.csv"
     params = dict(current=current, duration=duration,
                   voltage_limit=voltage_limit, record_interval=1)
-    bio.load_cp_technique(CHANNEL, **params)
-    bio.start_channel(CHANNEL)
-    with open(file_name, "w") as f:
-        f.write("time_s,voltage_V,current_A\n")
-        start = time.time()
-        while time.time() - start < duration:
-            vals = bio.read_values(CHANNEL)
-            f.write(f"{vals.ElapsedTime},{vals.Ewe},{vals.I}\n")
-            if vals.Ewe >= voltage_limit:
-                break
-            time.sleep(1)
-    bio.stop_channel(CHANNEL)
-    print(f"GCPL finished. Data saved to {file_name}")
+    # On the worker thread an exception would end the task silently: report it, and
+    # never leave the channel running
+    try:
+        bio.load_cp_technique(CHANNEL, **params)
+        bio.start_channel(CHANNEL)
+        with open(file_name, "w") as f:
+            f.write("time_s,voltage_V,current_A\n")
+            start = time.time()
+            while time.time() - start < duration:
+                vals = bio.read_values(CHANNEL)
+                f.write(f"{vals.ElapsedTime},{vals.Ewe},{vals.I}\n")
+                if vals.Ewe >= voltage_limit:
+                    break
+                if stop.wait(1):
+                    break
+        print(f"GCPL finished. Data saved to {file_name}")
+    except Exception as e:
+        print(f"Error during GCPL: {e}")
+    finally:
+        bio.stop_channel(CHANNEL)
 
 
 def run_peis(bio):
@@ -123,6 +171,9 @@ def run_peis(bio):
 
 def constant_force_move(linmot):
     """Move with fixed force parameters."""
+    if task_running():
+        print(f"'{_task_thread.name}' is running and may be driving the LinMot; stop it first (option 6)")
+        return
     pos = float(input("Position mm: "))
     vel = float(input("Max velocity (m/s): "))
     accel = float(input("Acceleration (m/s^2): "))
@@ -146,29 +197,45 @@ def dynamic_force_control(linmot, bio):
     duration = float(input("Duration (s): "))
     voltage_limit = float(input("Voltage limit (V): "))
     force = float(input("Initial force (N): "))
+    start_background("Dynamic force control", _dynamic_force_loop,
+                     linmot, bio, current, duration, voltage_limit, force)
+
 
+def _dynamic_force_loop(linmot, bio, current, duration, voltage_limit, force, stop):
     params = dict(current=current, duration=duration,
                   record_interval=1, voltage_limit=voltage_limit)
-    bio.load_cp_technique(CHANNEL, **params)
-    bio.start_channel(CHANNEL)
-
-    start = time.time()
-    linmot.set_force(force)
-    while time.time() - start < duration:
-        voltage = bio.read_voltage(CHANNEL)
-        position = linmot.ACI.getMonitoringChannelWithTimestamp(linmot.target_ip, 2).value
-        # Simple demo logic: adjust force depending on voltage
-        if voltage > voltage_limit * 0.9:
-            force = max(0, force - 0.5)
-        else:
-            force = min(100, force + 0.5)
-        linmot.set_force(force)
-        print(f"V={voltage:.2f}V pos={position:.2f}mm -> force {force:.2f}N")
-        time.sleep(1)
+    # As in _gcpl_loop: report errors, and never leave the channel running or the force applied
+    try:
+        bio.load_cp_technique(CHANNEL, **params)
+        bio.start_channel(CHANNEL)
 
-    bio.stop_channel(CHANNEL)
-    linmot.stop_force()
-    print("Dynamic force control finished")
+        start = time.time()
+        linmot.set_force(force)
+        last_sent_force = force
+        while time.time() - start < duration:
+            voltage = bio.read_voltage(CHANNEL)
+            position = linmot.ACI.getMonitoringChannelWithTimestamp(linmot.target_ip, 2).value
+            # Simple demo logic: adjust force depending on voltage
+            if voltage > voltage_limit * 0.9:
+                force = max(0, force - 0.5)
+            else:
+                force = min(100, force + 0.5)
+            # Each set_force is a UDP round-trip: skip it while the target is unchanged,
+            # e.g. when the force sits at a limit
+            if abs(force - last_sent_force) >= FORCE_EPSILON:
+                linmot.set_force(force)
+                last_sent_force = force
+            print(f"V={voltage:.2f}V pos={position:.2f}mm -> force {force:.2f}N")
+            if stop.wait(1):
+                break
+        print("Dynamic force control finished")
+    except Exception as e:
+        print(f"Error during dynamic force control: {e}")
+    finally:
+        try:
+            bio.stop_channel(CHANNEL)
+        finally:
+            linmot.stop_force()
 
 
 def interactive_menu(linmot, bio):
@@ -179,6 +246,7 @@ def interactive_menu(linmot, bio):
         print("3 - LinMot constant force move")
         print("4 - LinMot dynamic force control")
         print("5 - Run automated sequence")
+        print("6 - Stop background task")
         print("0 - Quit")
         choice = input("Selection: ").strip()
         if choice == '1':
@@ -190,8 +258,12 @@ def interactive_menu(linmot, bio):
         elif choice == '4':
             dynamic_force_control(linmot, bio)
         elif choice == '5':
-            automated_sequence(linmot, bio)
+            start_background("Automated sequence", automated_sequence, linmot, bio)
+        elif choice == '6':
+            stop_background()
         elif choice == '0':
+            if task_running():
+                stop_background()
             break
         else:
             print("Unknown selection")
@@ -203,6 +275,8 @@ def main():
         automated_sequence(linmot, bio)
         interactive_menu(linmot, bio)
     finally:
+        if task_running():
+            stop_background()
         linmot.disconnect()
         bio.shutdown()
 
@@ -1,3 +1,35 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the step then runs as plain Python
+    njit = None
+
+
+def _pid_step(error, prev_error, integral, kp, ki, kd, dt, low, high, has_limits):
+    """
+    Arithmetic of one PIDController.update() step.
+
+    Returns:
+        (output, integral) after the step, with anti-windup applied to the integral
+    """
+    integral += error * dt
+    output = kp * error + ki * integral + kd * (error - prev_error) / dt
+
+    if has_limits:
+        output_limited = max(low, min(output, high))
+        if output != output_limited and ki != 0:
+            integral -= (output - output_limited) * dt / ki
+        output = output_limited
+
+    return output, integral
+
+
+if njit is not None:
+    _pid_step = njit(cache=True)(_pid_step)
+    _pid_step(0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0, -1.0, 1.0, True)  # Compile at import, not in the loop
+
+
 class PIDController:
     def __init__(self, kp=1.0, ki=0.1, kd=0.01, setpoint=0.0, dt=0.1, output_limits=None):
         """
@@ -25,10 +57,43 @@ class PIDController:
         self.prev_error = 0.0
         self.last_output = 0.0
 
-        # Initialize history for monitoring
-        self.error_history = []
-        self.output_history = []
+        # Initialize history for monitoring: preallocated ring buffers, slot _hist_i is
+        # written next and overwrites the oldest entry once _hist_len == max_history
         self.max_history = 100
+        self._error_hist = np.empty(self.max_history)
+        self._output_hist = np.empty(self.max_history)
+        self._hist_i = 0
+        self._hist_len = 0
+
+    @property
+    def error_history(self):
+        """Last max_history errors, oldest first, as a new NumPy array."""
+        return self._history(self._error_hist)
+
+    @property
+    def output_history(self):
+        """Last max_history outputs, oldest first, as a new NumPy array."""
+        return self._history(self._output_hist)
+
+    def _history(self, ring):
+        if self._hist_len < self.max_history:
+            return ring[:self._hist_len].copy()
+        return np.concatenate((ring[self._hist_i:], ring[:self._hist_i]))
+
+    def _push_history(self, errors, outputs):
+        """Append equal-length arrays of errors and outputs to the ring buffers."""
+        n = len(errors)
+        size = self.max_history
+        if n >= size:
+            self._error_hist[:] = errors[-size:]
+            self._output_hist[:] = outputs[-size:]
+            self._hist_i = 0
+        else:
+            slots = (self._hist_i + np.arange(n)) % size
+            self._error_hist[slots] = errors
+            self._output_hist[slots] = outputs
+            self._hist_i = (self._hist_i + n) % size
+        self._hist_len = min(self._hist_len + n, size)
 
     def update(self, measured_value):
         """
@@ -44,43 +109,76 @@ class PIDController:
         # Calculate error
         error = self.setpoint - measured_value
 
-        # Store error history
-        self.error_history.append(error)
-        if len(self.error_history) > self.max_history:
-            self.error_history.pop(0)
+        # P, I (with anti-windup) and D terms, clipped to the output limits if specified;
+        # compiled with numba when it is installed
+        limits = self.output_limits
+        if limits is None:
+            output, self.integral = _pid_step(
+                error, self.prev_error, self.integral, self.kp, self.ki, self.kd, self.dt,
+                0.0, 0.0, False,
+            )
+        else:
+            output, self.integral = _pid_step(
+                error, self.prev_error, self.integral, self.kp, self.ki, self.kd, self.dt,
+                float(limits[0]), float(limits[1]), True,
+            )
 
-        # Calculate PID terms
-        p_term = self.kp * error
+        # Store state for next iteration
+        self.prev_error = error
+        self.last_output = output
 
-        # Update integral with anti-windup
-        self.integral += error * self.dt
-        i_term = self.ki * self.integral
+        # Store error and output history
+        i = self._hist_i
+        self._error_hist[i] = error
+        self._output_hist[i] = output
+        self._hist_i = (i + 1) % self.max_history
+        if self._hist_len < self.max_history:
+            self._hist_len += 1
 
-        # Calculate derivative term (on error)
-        d_term = self.kd * (error - self.prev_error) / self.dt
+        return output
 
-        # Calculate total output
-        output = p_term + i_term + d_term
+    def update_batch(self, measured_values):
+        """
+        Run update() over a sequence of measured values, e.g. to replay a recorded trace.
 
-        # Apply output limits if specified
-        if self.output_limits is not None:
-            output_limited = max(self.output_limits[0], min(output, self.output_limits[1]))
+        The P, I and D terms are computed for the whole array at once. If output limits
+        are set, the samples from the first saturated output on go through update()
+        one by one, so anti-windup behaves exactly as in the scalar loop.
 
-            # Anti-windup: adjust integral term if output is saturated
-            if output != output_limited:
-                # Adjust integral to prevent it from growing further in the wrong direction
-                self.integral -= (output - output_limited) * self.dt / self.ki if self.ki != 0 else 0
+        Args:
+            measured_values: 1-D array-like of process variable samples
 
-            output = output_limited
+        Returns:
+            NumPy array of control outputs, one per sample
+        """
+        measured = np.asarray(measured_values, dtype=float).ravel()
+        n = measured.size
+        if n == 0:
+            return np.empty(0)
+
+        error = self.setpoint - measured
+        # Same sequence of additions as integral += error * dt in update()
+        integral = np.cumsum(np.concatenate(([self.integral], error * self.dt)))[1:]
+        d_term = self.kd * np.diff(error, prepend=self.prev_error) / self.dt
+        output = self.kp * error + self.ki * integral + d_term
+
+        # Vectorized results are valid up to the first output that would be clipped
+        first_saturated = n
+        if self.output_limits is not None:
+            low, high = self.output_limits
+            saturated = np.flatnonzero((output < low) | (output > high))
+            if saturated.size:
+                first_saturated = int(saturated[0])
 
-        # Store state for next iteration
-        self.prev_error = error
-        self.last_output = output
+        if first_saturated:
+            last = first_saturated - 1
+            self.integral = float(integral[last])
+            self.prev_error = float(error[last])
+            self.last_output = float(output[last])
+            self._push_history(error[:first_saturated], output[:first_saturated])
 
-        # Store output history
-        self.output_history.append(output)
-        if len(self.output_history) > self.max_history:
-            self.output_history.pop(0)
+        for k in range(first_saturated, n):
+            output[k] = self.update(measured[k])
 
         return output
 
@@ -90,8 +188,8 @@ class PIDController:
         """
         self.integral = 0.0
         self.prev_error = 0.0
-        self.error_history = []
-        self.output_history = []
+        self._hist_i = 0
+        self._hist_len = 0
 
     def set_tunings(self, kp=None, ki=None, kd=None):
         """
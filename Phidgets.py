@@ -1,6 +1,6 @@
 import csv
+import os
 import time
-from threading import Lock
 from enum import Enum
 from Phidget22.Devices.VoltageRatioInput import VoltageRatioInput
 from Phidget22.Phidget import *
@@ -20,15 +20,44 @@ class PhidgetsForceSensor:
             serial_number: Phidget device serial number (optional)
             channel: Channel number (default 0)
         """
-        self.calibration_gain = calibration_gain
-        self.calibration_offset = calibration_offset
+        self._calibration_gain = float(calibration_gain)
+        self._calibration_offset = float(calibration_offset)
+        self._update_calibration()
+        # Written by the Phidgets callback thread, read by consumers; rebinding a single
+        # float attribute is atomic under the GIL, so no lock is needed
         self.current_force = 0.0
-        self._lock = Lock()
         self.ch = VoltageRatioInput()
         if serial_number is not None:
             self.ch.setDeviceSerialNumber(serial_number)
         self.ch.setChannel(channel)
 
+    @property
+    def calibration_gain(self):
+        return self._calibration_gain
+
+    @calibration_gain.setter
+    def calibration_gain(self, value):
+        self._calibration_gain = float(value)
+        self._update_calibration()
+
+    @property
+    def calibration_offset(self):
+        return self._calibration_offset
+
+    @calibration_offset.setter
+    def calibration_offset(self, value):
+        self._calibration_offset = float(value)
+        self._update_calibration()
+
+    def _update_calibration(self):
+        """
+        Fold gain and offset into force = ratio * gain + bias for the callback.
+
+        (gain, bias) is rebound as one tuple, so the callback thread never combines
+        the new gain with the old bias.
+        """
+        self._cal = (self._calibration_gain, -self._calibration_offset * self._calibration_gain)
+
     def zero(self, samples=100, delay=0.01):
         """
         Automatically calibrate the zero-force voltage ratio offset.
@@ -54,8 +83,8 @@ class PhidgetsForceSensor:
                     ch: Channel object (provided by Phidgets API)
                     voltage: Voltage reading from the sensor
                 """
-        with self._lock:
-            self.current_force = (ratio - self.calibration_offset) * self.calibration_gain
+        gain, bias = self._cal
+        self.current_force = ratio * gain + bias
 
     def on_attach(self, ch):
         """
@@ -110,8 +139,7 @@ class PhidgetsForceSensor:
         Returns:
             Force in newtons
         """
-        with self._lock:
-            return self.current_force
+        return self.current_force
 
     def set_data_interval(self, interval_ms):
         """
@@ -144,6 +172,8 @@ if __name__ == "__main__":
     CHANNEL = 3
     DURATION_SEC = 10000
     OUTPUT_CSV = "force_data.csv"
+    FSYNC_INTERVAL_S = 5.0  # Buffered rows are written and fsynced at least this often
+    STATUS_EVERY = 100      # Samples between status lines
 
 
     # rated_output = 0.9842e-3  #V/V
@@ -168,21 +198,41 @@ if __name__ == "__main__":
     # sensor.zero()
     print("Collecting force data...")
 
-    with open(OUTPUT_CSV, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Timestamp (s)", "Force (N)"])
-        start = time.time()
+    with open(OUTPUT_CSV, "w", newline="", buffering=1 << 20) as f:
+        csv.writer(f).writerow(["Timestamp (s)", "Force (N)"])
+        # Numeric rows need no quoting: one %-format per row gives the same text as
+        # csv.writer (str of each float, CRLF)
+        row_fmt = "%s,%s\r\n"
+        # Bound once outside the logging loop
+        get_force = sensor.get_force
+        rows = []
+        append_row = rows.append
+        now, sleep = time.perf_counter, time.sleep
+        start = last_fsync = now()
+        n = 0
 
         try:
-            while time.time() - start < DURATION_SEC:
-                timestamp = time.time() - start
-                force = sensor.get_force()
-                print(f"{timestamp:.2f}s: {force:.3f} N")
-                writer.writerow([timestamp, force])
-                time.sleep(1)
+            while now() - start < DURATION_SEC:
+                timestamp = now() - start
+                force = get_force()
+                append_row(row_fmt % (timestamp, force))
+                n += 1
+                # A crash loses at most FSYNC_INTERVAL_S of data, whatever the sample rate
+                if now() - last_fsync >= FSYNC_INTERVAL_S:
+                    f.write("".join(rows))
+                    rows.clear()
+                    f.flush()
+                    os.fsync(f.fileno())
+                    last_fsync = now()
+                if n % STATUS_EVERY == 0:
+                    print(f"{timestamp:.2f}s: {force:.3f} N ({n} samples)")
+                sleep(1)
         except KeyboardInterrupt:
             print("Logging stopped manually.")
         finally:
+            f.write("".join(rows))
+            f.flush()
+            os.fsync(f.fileno())
             sensor.close()
 
     print(f"Data collection complete. Saved to {OUTPUT_CSV}.")
\ No newline at end of file
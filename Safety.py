@@ -1,25 +1,46 @@
+import logging
+
 import numpy as np
-from collections import deque
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the rate check then runs as plain Python
+    njit = None
+
+RATE_VOLTAGE = 1  # _rate_check bit: voltage rate limit exceeded
+RATE_FORCE = 2    # _rate_check bit: force rate limit exceeded
+
+# Limit violations are reported through logging; with no handler configured, warnings
+# still reach stderr. SafetyMonitor reports the first violation and every LOG_EVERY-th
+# after it, so a sustained fault does not flood the output from the sampling loop
+logger = logging.getLogger("safety")
+LOG_EVERY = 256
 
 
-def check_safety(voltage, force, max_voltage=5.0, max_force=100.0):
+def check_safety(voltage, force, max_voltage=5.0, max_force=100.0, log=True):
     """
-    Return True if everything is safe; False if we exceed thresholds.
+    Return True if everything is safe; False if we exceed thresholds or a reading is NaN.
 
     Args:
         voltage: Current voltage
         force: Current force
         max_voltage: Maximum allowed voltage
         max_force: Maximum allowed force
+        log: Log a warning naming the exceeded limit
 
     Returns:
         True if safe, False otherwise
     """
-    if abs(voltage) > max_voltage:
-        print(f"Voltage {voltage:.2f} exceeds limit {max_voltage:.2f}")
-        return False
-    if abs(force) > max_force:
-        print(f"Force {force:.2f} exceeds limit {max_force:.2f}")
+    # Written as "not within limit" so a NaN reading (every comparison False) fails
+    voltage_ok = abs(voltage) <= max_voltage
+    if not (voltage_ok and abs(force) <= max_force):
+        # Only the unsafe path reports which limit was hit
+        if not log:
+            pass
+        elif not voltage_ok:
+            logger.warning("Voltage %.2f exceeds limit %.2f", voltage, max_voltage)
+        else:
+            logger.warning("Force %.2f exceeds limit %.2f", force, max_force)
         return False
     return True
 
@@ -48,30 +69,112 @@ def dynamic_safety_check(voltage, force, history, max_voltage=4.3, max_force=100
 
     # Need enough history to check rates
     if len(history) > window_size:
-        # Calculate time differences
-        time_now = history[-1][2]
-        time_past = history[-window_size][2]
-        dt = time_now - time_past
+        voltage_past, force_past, time_past = history[-window_size]
+        return check_rates(voltage, force, voltage_past, force_past, history[-1][2] - time_past,
+                           max_voltage_rate, max_force_rate)
 
-        if dt > 0:  # Avoid division by zero
-            # Calculate voltage rate of change
-            voltage_past = history[-window_size][0]
-            voltage_rate = abs(voltage - voltage_past) / dt
+    return True
 
-            # Calculate force rate of change
-            force_past = history[-window_size][1]
-            force_rate = abs(force - force_past) / dt
 
-            # Check rate limits
-            if voltage_rate > max_voltage_rate:
-                print(f"Voltage rate {voltage_rate:.2f} V/s exceeds limit {max_voltage_rate:.2f} V/s")
-                return False
+def _rate_check(v_now, v_past, f_now, f_past, dt, max_vr, max_fr):
+    """
+    Arithmetic of check_rates.
+
+    Returns:
+        Bitmask of exceeded limits (RATE_VOLTAGE | RATE_FORCE), 0 if safe
+    """
+    mask = 0
+    if dt > 0:  # Rates are undefined otherwise
+        # |dx| / dt > max_rate, compared without dividing
+        if abs(v_now - v_past) > max_vr * dt:
+            mask |= RATE_VOLTAGE
+        if abs(f_now - f_past) > max_fr * dt:
+            mask |= RATE_FORCE
+    return mask
 
-            if force_rate > max_force_rate:
-                print(f"Force rate {force_rate:.2f} N/s exceeds limit {max_force_rate:.2f} N/s")
-                return False
 
-    return True
+if njit is not None:
+    _rate_check = njit(cache=True)(_rate_check)
+    _rate_check(0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0)  # Compile at import, not in the loop
+
+
+def check_rates(voltage, force, voltage_past, force_past, dt,
+                max_voltage_rate=0.2, max_force_rate=10.0, log=True):
+    """
+    Check the voltage and force rates of change against an earlier sample.
+
+    Args:
+        voltage: Current voltage
+        force: Current force
+        voltage_past: Voltage of the earlier sample
+        force_past: Force of the earlier sample
+        dt: Time since the earlier sample (s); no check unless positive
+        max_voltage_rate: Maximum allowed voltage change rate (V/s)
+        max_force_rate: Maximum allowed force change rate (N/s)
+        log: Log a warning naming the exceeded limit
+
+    Returns:
+        True if safe, False otherwise
+    """
+    mask = _rate_check(voltage, voltage_past, force, force_past, dt,
+                       max_voltage_rate, max_force_rate)
+    if not mask:
+        return True
+
+    # Rates are only worked out again for the message
+    if not log:
+        pass
+    elif mask & RATE_VOLTAGE:
+        logger.warning("Voltage rate %.2f V/s exceeds limit %.2f V/s",
+                       abs(voltage - voltage_past) / dt, max_voltage_rate)
+    else:
+        logger.warning("Force rate %.2f N/s exceeds limit %.2f N/s",
+                       abs(force - force_past) / dt, max_force_rate)
+    return False
+
+
+def check_batch(voltages, forces, timestamps, max_voltage=4.3, max_force=100.0,
+                max_voltage_rate=0.2, max_force_rate=10.0, window_size=5):
+    """
+    Vectorized dynamic_safety_check over a whole recording, e.g. for replay or analysis.
+
+    Sample i gets the result dynamic_safety_check would give it with samples 0..i
+    (inclusive) as the history; no warnings are logged.
+
+    Args:
+        voltages: Voltage samples (1-D array-like)
+        forces: Force samples, same length
+        timestamps: Sample times (s), same length
+        max_voltage: Maximum allowed voltage
+        max_force: Maximum allowed force
+        max_voltage_rate: Maximum allowed voltage change rate (V/s)
+        max_force_rate: Maximum allowed force change rate (N/s)
+        window_size: Number of samples to use for rate calculation
+
+    Returns:
+        (safe, first_violation): boolean array, True where the sample is safe, and the
+        index of the first unsafe sample (-1 if there is none)
+    """
+    v = np.asarray(voltages, dtype=np.float64)
+    f = np.asarray(forces, dtype=np.float64)
+    t = np.asarray(timestamps, dtype=np.float64)
+
+    # Absolute limits; NaN fails, as in check_safety
+    safe = (np.abs(v) <= max_voltage) & (np.abs(f) <= max_force)
+
+    # Rates of samples window_size.. against the sample window_size - 1 before each
+    n = len(v)
+    if n > window_size:
+        now, past = slice(window_size, n), slice(1, n - window_size + 1)
+        dt = t[now] - t[past]
+        rate_bad = (dt > 0) & (
+            (np.abs(v[now] - v[past]) > max_voltage_rate * dt)
+            | (np.abs(f[now] - f[past]) > max_force_rate * dt)
+        )
+        safe[now] &= ~rate_bad
+
+    first_violation = int(np.argmin(safe)) if n and not safe.all() else -1
+    return safe, first_violation
 
 
 class SafetyMonitor:
@@ -97,26 +200,54 @@ class SafetyMonitor:
         self.max_voltage_rate = max_voltage_rate
         self.max_force_rate = max_force_rate
 
-        # Use deque for efficient history management
-        self.history = deque(maxlen=history_length)
+        # History as preallocated ring buffers, one array per field; slot _idx is
+        # written next and _count samples are valid
+        self.history_length = history_length
+        self._voltages = np.empty(history_length)
+        self._forces = np.empty(history_length)
+        self._times = np.empty(history_length)
+        self._idx = 0
+        self._count = 0
 
         # Track consecutive warnings
         self.consecutive_warnings = 0
         self.max_consecutive_warnings = 3
 
+        # Failed checks so far; only every LOG_EVERY-th one is logged
+        self._violations = 0
+
+        # Rates are measured against the sample window_size - 1 before the current one,
+        # as in dynamic_safety_check; they are not checked until the history is longer
+        self.window_size = 5
+
         # Flag for system state
         self.is_safe = True
 
+    @property
+    def history(self):
+        """
+        Samples as (voltage, force, timestamp) tuples, oldest first (a new list).
+        """
+        order = (self._idx - self._count + np.arange(self._count)) % self.history_length
+        return list(zip(self._voltages[order].tolist(), self._forces[order].tolist(),
+                        self._times[order].tolist()))
+
     def add_sample(self, voltage, force, timestamp):
         """
-        Add a new sample to the history.
+        Add a new sample to the history, overwriting the oldest once it is full.
 
         Args:
             voltage: Current voltage
             force: Current force
             timestamp: Current timestamp
         """
-        self.history.append((voltage, force, timestamp))
+        i = self._idx
+        self._voltages[i] = voltage
+        self._forces[i] = force
+        self._times[i] = timestamp
+        self._idx = (i + 1) % self.history_length
+        if self._count < self.history_length:
+            self._count += 1
 
     def check(self, voltage, force, timestamp):
         """
@@ -130,36 +261,55 @@ class SafetyMonitor:
         Returns:
             True if safe, False otherwise
         """
-        # Add current sample to history
-        self.add_sample(voltage, force, timestamp)
+        # Add current sample to history (inlined add_sample, attributes read once)
+        n = self.history_length
+        voltages, forces, times = self._voltages, self._forces, self._times
+        i = self._idx
+        voltages[i] = voltage
+        forces[i] = force
+        times[i] = timestamp
+        self._idx = idx = (i + 1) % n
+        count = self._count
+        if count < n:
+            self._count = count = count + 1
 
         # Perform basic safety check
-        basic_safe = check_safety(voltage, force, self.max_voltage, self.max_force)
+        violations = self._violations
+        log = violations % LOG_EVERY == 0
+        # The check that makes the system unsafe is always reported
+        basic_safe = check_safety(voltage, force, self.max_voltage, self.max_force,
+                                  log or self.is_safe)
 
         if not basic_safe:
+            self._violations = violations + 1
             self.is_safe = False
+            return False
+
+        # Not enough history for the dynamic check yet
+        window_size = self.window_size
+        if count <= window_size:
+            self.consecutive_warnings = 0
             return self.is_safe
 
-        # Perform dynamic safety check if we have enough history
-        if len(self.history) > 5:
-            dynamic_safe = dynamic_safety_check(
-                voltage, force, list(self.history),
-                self.max_voltage, self.max_force,
-                self.max_voltage_rate, self.max_force_rate
-            )
-        else:
-            dynamic_safe = True
+        # Perform dynamic safety check (the absolute limits were checked above)
+        past = (idx - window_size) % n
+        dynamic_safe = check_rates(
+            voltage, force, voltages[past], forces[past], timestamp - times[past],
+            self.max_voltage_rate, self.max_force_rate, log
+        )
 
         # Update consecutive warnings counter
-        if not dynamic_safe:
-            self.consecutive_warnings += 1
+        if dynamic_safe:
+            self.consecutive_warnings = warnings = 0
         else:
-            self.consecutive_warnings = 0
-
+            self.consecutive_warnings = warnings = self.consecutive_warnings + 1
+            self._violations = violations + 1
 
-        # System is unsafe if too many consecutive warnings
-        if self.consecutive_warnings >= self.max_consecutive_warnings:
+        # System is unsafe if too many consecutive warnings; the escalation itself is
+        # always logged, repeats after it only every LOG_EVERY-th violation
+        if warnings >= self.max_consecutive_warnings:
             self.is_safe = False
-            print(f"SAFETY CRITICAL: {self.consecutive_warnings} consecutive warnings")
+            if log or warnings == self.max_consecutive_warnings:
+                logger.critical("SAFETY CRITICAL: %d consecutive warnings", warnings)
 
         return self.is_safe
\ No newline at end of file
@@ -203,7 +203,7 @@ class KBIO_api:
         self.BL_StartChannels(id_, ch_map, results, len(results))
 
         ok = True
-        nb = max(channels)
+        nb = len(channels)  # channels is the boolean map, one entry per channel
 
         # decode the results array and print errors, if any
         for ch, r in enumerate(results):
@@ -223,7 +223,7 @@ class KBIO_api:
         self.BL_StopChannels(id_, ch_map, results, len(results))
 
         ok = True
-        nb = max(channels)
+        nb = len(channels)  # channels is the boolean map, one entry per channel
 
         # decode the results array and print errors, if any
         for ch, r in enumerate(results):
@@ -232,13 +232,15 @@ class KBIO_api:
             if r != 0:
                 ok = False
             error = self.Error(r)
-            error.check("StopChannels on {ch+1}", abort=False)
+            error.check(f"StopChannels on {ch+1}", abort=False)
 
         # return whether an error occured
         return ok
 
-    def GetCurrentValues(self, id_, ch):
-        cv = KBIO.CurrentValues()
+    def GetCurrentValues(self, id_, ch, cv=None):
+        # cv may be a caller-owned CurrentValues to fill in place
+        if cv is None:
+            cv = KBIO.CurrentValues()
         self.BL_GetCurrentValues(id_, ch - 1, cv)
         return cv
 
@@ -31,6 +31,12 @@ def make_ecc_parm(api, ecc_parm, value=0, index=0):
     return parm
 
 
+def update_ecc_parm(api, parm, ecc_parm, value=0, index=0):
+    """Refresh an existing EccParam in place with a new value and optional index, and return it."""
+    api.DefineParameter(ecc_parm.label, ecc_parm.type_(value), index, parm)
+    return parm
+
+
 def make_ecc_parms(api, *ecc_parm_list):
     """Create an EccParam array from an EccParam list, and return an EccParams refering to it."""
     nb_parms = len(ecc_parm_list)
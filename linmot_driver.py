@@ -0,0 +1,451 @@
+"""Minimal wrapper around the LinUDP .NET API used to control a LinMot motor.
+
+Shared by LinMot.py and LinMot+T.py, so the CLR and LinUDP.dll are loaded once per process.
+"""
+
+from __future__ import annotations
+
+import clr
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+# LinUDP assemblies already added to the CLR in this process
+_CLR_REFERENCES = set()
+
+
+# Binary log record of record_force_current_position(binary=True): the CSV columns as
+# little-endian float64 (drive values too, so skipped slots can hold nan)
+_LOG_RECORD = struct.Struct("<5d")
+
+
+def load_binary_log(path):
+    """Memory-map a binary log written by record_force_current_position(binary=True).
+
+    Returns a read-only NumPy structured array with the same column names as the CSV.
+    """
+    import numpy as np
+
+    with open(path + ".schema.json") as schema_file:
+        schema = json.load(schema_file)
+    return np.memmap(path, dtype=[tuple(c) for c in schema["dtype"]], mode="r")
+
+
+def _write_all(fd, data):
+    """os.write until all of data is on the file (os.write may write less)."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+class LinMotForceController:
+    def __init__(self, dll_path, target_ip, target_port="49360", host_ip="192.109.209.100", host_port="41136"):
+        if dll_path not in _CLR_REFERENCES:
+            clr.AddReference(dll_path) # type: ignore
+            _CLR_REFERENCES.add(dll_path)
+        import LinUDP # type: ignore
+        self.LinUDP = LinUDP
+        self.target_ip = target_ip
+        self.target_port = target_port
+        self.host_ip = host_ip
+        self.host_port = host_port
+        self.ACI = LinUDP.ACI()
+        self.connected = False
+
+        # target_ip as a System.String, built once so monitoring reads do not convert
+        # the Python str on every call
+        from System import String # type: ignore
+        self._target_ip_net = String(target_ip)
+
+        # Bound ACI methods for the calls made repeatedly from control loops, so each
+        # call skips the attribute lookup on the .NET object
+        self._change_target_force = self.ACI.LMfc_ChangeTargetForce
+        self._move_with_force_limit = self.ACI.LMfc_IncrementActPosWithHigherForceCtrlLimitAndTargetForce
+
+        # Background monitoring (see start_monitoring): latest frame, or the exception of the
+        # latest failed read, replaced atomically
+        self._latest = None
+        self._monitor_thread = None
+        self._monitor_stop = threading.Event()
+
+    def __enter__(self) -> "LinMotForceController":  # type: ignore[override]
+        if not self.connect():
+            raise RuntimeError("Failed to connect to LinMot")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> Optional[bool]:  # type: ignore[override]
+        self.disconnect()
+        return False
+
+    def connect(self):
+        self.ACI.ClearTargetAddressList()
+        self.ACI.SetTargetAddressList(self.target_ip, self.target_port)
+        self.ACI.ActivateConnection(self.host_ip, self.host_port)
+        self.connected = self.ACI.isConnected(self.target_ip)
+        return self.connected
+
+    def _get_state(self):
+        return self.ACI.getStateMachineState(self.target_ip)
+
+    def _pretty_state(self, st=None):
+        st = st if st is not None else self._get_state()
+        try:
+            return f"{st} ({int(st)})"
+        except Exception:
+            return str(st)
+
+    def ensure_drive_ready_for_motion(self, timeout=30):
+        """Simple, reliable bring-up: ack errors, call SwitchOn(), wait for OperationEnabled."""
+        if self.ACI.isError(self.target_ip):
+            print("Acknowledging errors...")
+            self.ACI.AckErrors(self.target_ip)
+            time.sleep(0.2)
+
+        print(f"Initial drive state: {self._pretty_state()}")
+
+        t0 = time.time()
+        if not self.ACI.isHomed(self.target_ip):
+            print("Drive is not homed. Calling Homing()...")
+            if not self.ACI.Homing(self.target_ip):
+                raise RuntimeError("Homing() call failed.")
+            print("Waiting for homing to complete...")
+
+        print("Drive is Operation Enabled.")
+
+    def set_force(self, force_n):
+        return self._change_target_force(self._target_ip_net, float(force_n))
+
+    def stop_force(self):
+        return self.set_force(0.0)
+
+    def disconnect(self):
+        self.stop_monitoring()
+        self.ACI.CloseConnection()
+        self.connected = False
+
+    def move_with_force_limit_and_target(
+        self,
+        position_mm: float,
+        max_velocity: float,
+        acceleration: float,
+        force_limit_n: float,
+        target_force_n: float,
+    ) -> bool:
+        """Move to a position while controlling force."""
+        print("changing force now...")
+        return self._move_with_force_limit(
+            self._target_ip_net,
+            float(position_mm),
+            float(max_velocity),
+            float(acceleration),
+            float(force_limit_n),
+            float(target_force_n),
+        )
+
+    def ensure_force_control_ready(
+            self,
+            position_mm: float,
+            velocity: float = 0.1,
+            acceleration: float = 0.2,
+            force_limit_n: float = 20.0,
+            target_force_n: float = 200.0,
+            reset_if_needed: bool = True
+    ) -> bool:
+        """
+        Ensure the drive is in a valid state for force control.
+        If already in force mode, it updates the target force.
+        If not, it sends a force-control motion command.
+
+        Args:
+            position_mm: Position increment to apply if force control is re-triggered.
+            velocity: Velocity for the force control move.
+            acceleration: Acceleration for the force control move.
+            force_limit_n: Threshold force to switch from position to force control.
+            target_force_n: Desired target force.
+            reset_if_needed: If True, will reset into force control mode if not active.
+        Returns:
+            True if ready or successfully entered force control mode, False otherwise.
+        """
+        print("Checking force control readiness...")
+
+        if self.ACI.isError(self.target_ip):
+            error_txt = self.ACI.LMcf_GetErrorTxt(self.target_ip)
+            raise RuntimeError(f"Drive error: {error_txt}")
+
+        if self.ACI.isSpecialMotionActive(self.target_ip):
+            print("Drive is already in special motion (likely force control).")
+            print(f"Updating target force to {target_force_n} N...")
+            self.ACI.LMfc_ChangeTargetForce(self.target_ip, float(target_force_n))
+            return True
+
+        if not reset_if_needed:
+            print("Force control is not active and reset_if_needed is False — skipping reset.")
+            return False
+
+        print("Resetting force control state before reapplying...")
+        self.ACI.LMfc_GoToPosRstForceCtrlSetI(
+            self.target_ip,
+            float(position_mm - 1),
+            float(velocity),
+            float(acceleration),
+            float(acceleration),
+        )
+        time.sleep(0.2)
+
+        print(f"Starting force control to position {position_mm} mm with {target_force_n} N...")
+        success = self.ACI.LMfc_IncrementActPosWithHigherForceCtrlLimitAndTargetForce(
+            self.target_ip,
+            float(position_mm),
+            float(velocity),
+            float(acceleration),
+            float(force_limit_n),
+            float(target_force_n),
+        )
+        return success
+
+    # Monitoring channels holding force, current and position, in that order
+    MONITORING_CHANNELS = (2, 3, 4)
+
+    def get_motor_data(self, out=None):
+        """Get current motor data (force, current, position).
+
+        While start_monitoring() is active this returns the latest frame read in the
+        background, without touching the network, and raises if the latest background read
+        failed; otherwise the drive is queried directly.
+        With out (a mutable sequence of 3), the values are stored there as
+        [force, current, position] and out is returned instead of a new dict.
+        """
+        frame = self._latest
+        if frame is None:
+            frame = self._read_motor_data()
+        elif isinstance(frame, Exception):
+            # Never query the drive here while the monitor thread is using it
+            raise RuntimeError("LinMot background monitoring read failed") from frame
+        if out is not None:
+            out[0], out[1], out[2] = frame
+            return out
+        force, current, position = frame
+        return {
+            'force_raw': force,
+            'current_raw': current,
+            'position_raw': position
+        }
+
+    def start_monitoring(self, period_s: float = 0.01) -> None:
+        """Keep reading the monitoring channels on a background thread every period_s seconds."""
+        if self._monitor_thread is not None:
+            return
+        self._monitor_stop.clear()
+        self._latest = self._read_motor_data()  # Valid frame before the first caller reads
+        self._monitor_thread = threading.Thread(
+            target=self._monitor_loop, args=(period_s,), name="linmot-monitor", daemon=True
+        )
+        self._monitor_thread.start()
+
+    def stop_monitoring(self) -> None:
+        if self._monitor_thread is None:
+            return
+        self._monitor_stop.set()
+        self._monitor_thread.join()
+        self._monitor_thread = None
+        self._latest = None
+
+    def _monitor_loop(self, period_s):
+        while not self._monitor_stop.wait(period_s):
+            try:
+                self._latest = self._read_motor_data()
+            except Exception as e:
+                # Replace the stale frame: get_motor_data() raises until a read succeeds again
+                self._latest = e
+
+    def _read_motor_data(self):
+        """Read (force, current, position) from the drive.
+
+        The three monitoring channels are read back to back through one bound ACI getter,
+        so they come from the same drive status frame whenever possible.
+        """
+        get_channel = self.ACI.getMonitoringChannelWithTimestamp
+        ip = self._target_ip_net
+        return tuple([get_channel(ip, ch).value for ch in self.MONITORING_CHANNELS])
+
+    def record_force_current_position(
+            self,
+            duration_s: int = 20,
+            interval_s: float = 0.1,
+            csv_path: str = "linmot_data.csv",
+            batch_size: int = 1000,
+            concurrent_reads: bool = False,
+            fsync_interval_s: Optional[float] = 5.0,
+            binary: bool = False,
+    ) -> None:
+        """Log force, current and position data to `csv_path`.
+
+        The sampling loop only takes readings and queues them; a writer thread (see
+        _log_writer_loop) formats them and writes every `batch_size` samples to the
+        file's raw descriptor, so neither formatting nor disk I/O delays a sample.
+        With `concurrent_reads`, the three monitoring channels are requested at the same
+        time from a small thread pool instead of one round-trip after another.
+
+        Sample k is due at start + k * interval_s on the perf_counter clock. If a stall
+        puts the loop more than one slot behind, the missed slots are written as rows
+        with their nominal times and nan values and sampling resumes in the current
+        slot, so the timeline stays aligned with the clock.
+
+        Every `fsync_interval_s` seconds the pending rows are written and fsynced, so a
+        crash loses at most that much data; a larger value (or None, to leave it to the
+        OS) trades durability for fewer disk syncs.
+
+        With `binary`, `csv_path` receives headerless 40-byte float64 records in the
+        same column order instead of text, and the layout goes to
+        `csv_path + ".schema.json"`; read it back with load_binary_log().
+        """
+        header = ["system_time", "time_s", "force_raw", "current_raw", "position_raw"]
+        if binary:
+            pack_into, record_size = _LOG_RECORD.pack_into, _LOG_RECORD.size
+
+            def encode(batch):
+                buf = bytearray(record_size * len(batch))
+                for j, row in enumerate(batch):
+                    pack_into(buf, j * record_size, *row)
+                return buf
+
+            with open(csv_path + ".schema.json", "w") as schema_file:
+                json.dump({"struct": _LOG_RECORD.format, "record_size": record_size,
+                           "dtype": [(name, "<f8") for name in header]}, schema_file, indent=2)
+        else:
+            # All-numeric rows need no quoting, so they skip csv.writer; %s gives the same
+            # text csv would (str of int/float), CRLF like csv.writer
+            row_fmt = "%s,%s,%s,%s,%s\r\n"
+
+            def encode(batch):
+                return "".join([row_fmt % row for row in batch]).encode()
+
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        fd = os.open(csv_path, flags, 0o644)
+        rows = queue.SimpleQueue()
+        writer_errors = []
+        writer_thread = None
+        pool = None
+        skipped = 0
+        try:
+            if not binary:
+                _write_all(fd, (",".join(header) + "\r\n").encode())
+            writer_thread = threading.Thread(
+                target=self._log_writer_loop,
+                args=(fd, encode, rows, batch_size, fsync_interval_s, writer_errors),
+                name="linmot-log-writer",
+                daemon=True,
+            )
+            writer_thread.start()
+
+            pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="linmot-read") if concurrent_reads else None
+            n_samples = int(duration_s // interval_s)
+            # Loop invariants, resolved once instead of on every sample
+            get_channel = self.ACI.getMonitoringChannelWithTimestamp
+            ip = self._target_ip_net
+            channels = self.MONITORING_CHANNELS
+            submit = pool.submit if pool is not None else None
+            put_row = rows.put
+            wall, now, sleep = time.time, time.perf_counter, time.sleep
+            nan = float("nan")
+
+            start = wall()
+            start_pc = now()  # Monotonic clock for pacing and time_s
+            i = 0
+            while i < n_samples:
+                if writer_errors:
+                    raise RuntimeError(f"Log writer failed: {writer_errors[0]}")
+                t_sys = wall()
+                t_elapsed = now() - start_pc
+                # If functions with timestamp are used, monitoring channel 1 on all drives must be configured to UPID 82h (Operating Sub Hours) !
+                if submit is None:
+                    force = get_channel(ip, 2)
+                    current = get_channel(ip, 3)
+                    position = get_channel(ip, 4)
+                else:
+                    futures = [submit(get_channel, ip, ch) for ch in channels]
+                    force, current, position = [future.result() for future in futures]
+
+                put_row((t_sys, t_elapsed, position.value, force.value, current.value))
+
+                i += 1
+                elapsed = now() - start_pc
+                if elapsed > (i + 1) * interval_s:
+                    # Fell behind by more than a slot: mark the missed slots and
+                    # continue with the slot the clock is in now
+                    current_slot = min(int(elapsed // interval_s), n_samples)
+                    for k in range(i, current_slot):
+                        put_row((start + k * interval_s, k * interval_s, nan, nan, nan))
+                    skipped += current_slot - i
+                    i = current_slot
+                else:
+                    sleep(max(0, interval_s * i - elapsed))
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+            # Keep the samples taken so far, also after an error or Ctrl+C
+            if writer_thread is not None:
+                rows.put(None)
+                writer_thread.join()
+            os.close(fd)
+            if skipped:
+                print(f"Warning: {skipped} samples were skipped after the loop fell behind")
+
+        if writer_errors:
+            raise RuntimeError(f"Log writer failed: {writer_errors[0]}")
+
+    @staticmethod
+    def _log_writer_loop(fd, encode, rows, batch_size, fsync_interval_s, errors):
+        """Write queued rows to fd until a None sentinel arrives.
+
+        Rows are turned into bytes by encode(rows) and written once batch_size of them are pending, when
+        fsync_interval_s has passed since the last sync (the file is then fsynced too),
+        and at the end. A write error is recorded in errors and the queue keeps being
+        drained, so the sampling loop never blocks on a dead writer.
+        """
+        pending = []
+        last_sync = time.perf_counter()
+        done = False
+        while not done:
+            try:
+                row = rows.get(timeout=fsync_interval_s)
+                if row is None:
+                    done = True
+                else:
+                    pending.append(row)
+            except queue.Empty:
+                pass
+
+            if errors:
+                pending.clear()
+                continue
+            now = time.perf_counter()
+            sync_due = fsync_interval_s is not None and now - last_sync >= fsync_interval_s
+            try:
+                if pending and (done or sync_due or len(pending) >= batch_size):
+                    _write_all(fd, encode(pending))
+                    pending.clear()
+                if sync_due or done:
+                    os.fsync(fd)
+                    last_sync = now
+            except Exception as e:
+                errors.append(e)
+
+    def move_abs(self,
+        position_mm: float,
+        max_velocity: float,
+        acceleration: float,
+        deceleration: float,
+    ) -> bool:
+        return self.ACI.LMmt_MoveAbs(
+            self.target_ip,
+            float(position_mm),
+            float(max_velocity),
+            float(acceleration),
+            float(deceleration),
+        )
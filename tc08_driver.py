@@ -0,0 +1,277 @@
+"""Direct ctypes interface to the Pico TC-08 thermocouple logger (usbtc08.dll)."""
+
+import os
+import ctypes
+import platform
+import time
+from ctypes import byref, c_int16, c_int32, c_float, c_char, POINTER
+
+import numpy as np
+
+
+# Direct DLL interface without picosdk wrapper
+class DirectTC08:
+    def __init__(self, dll_path=r"C:\Program Files (x86)\PicoLog\usbtc08.dll"):
+        # Load the DLL directly
+        os.add_dll_directory(os.path.dirname(dll_path))
+        self.dll = ctypes.WinDLL(dll_path)
+
+        # Define function prototypes based on the programmer's guide
+        self._setup_function_prototypes()
+
+        print(f"Using DLL: {dll_path} | Python: {platform.architecture()[0]}")
+
+    def _setup_function_prototypes(self):
+        self.dll.usb_tc08_open_unit.restype = c_int16
+        self.dll.usb_tc08_open_unit.argtypes = []
+
+        self.dll.usb_tc08_close_unit.restype = c_int16
+        self.dll.usb_tc08_close_unit.argtypes = [c_int16]
+
+        self.dll.usb_tc08_set_mains.restype = c_int16
+        self.dll.usb_tc08_set_mains.argtypes = [c_int16, c_int16]
+
+        self.dll.usb_tc08_set_channel.restype = c_int16
+        self.dll.usb_tc08_set_channel.argtypes = [c_int16, c_int16, c_char]
+
+        self.dll.usb_tc08_get_single.restype = c_int16
+        self.dll.usb_tc08_get_single.argtypes = [c_int16, POINTER(c_float), POINTER(c_int16), c_int16]
+
+        self.dll.usb_tc08_get_last_error.restype = c_int16
+        self.dll.usb_tc08_get_last_error.argtypes = [c_int16]
+
+        # Streaming mode
+        self.dll.usb_tc08_get_minimum_interval_ms.restype = c_int32
+        self.dll.usb_tc08_get_minimum_interval_ms.argtypes = [c_int16]
+
+        self.dll.usb_tc08_run.restype = c_int32
+        self.dll.usb_tc08_run.argtypes = [c_int16, c_int32]
+
+        self.dll.usb_tc08_get_temp.restype = c_int32
+        self.dll.usb_tc08_get_temp.argtypes = [
+            c_int16, POINTER(c_float), POINTER(c_int32), c_int32, POINTER(c_int16), c_int16, c_int16, c_int16
+        ]
+
+        self.dll.usb_tc08_stop.restype = c_int16
+        self.dll.usb_tc08_stop.argtypes = [c_int16]
+
+
+# Channels flagged by each 9-bit usb_tc08_get_single overflow mask (bit i = channel i)
+_OVERFLOW_CHANNELS = tuple(tuple(i for i in range(9) if mask >> i & 1) for mask in range(512))
+
+
+class TC08Reader:
+    USBTC08_UNITS_C = 0  # Celsius
+    USBTC08_UNITS_F = 1  # Fahrenheit
+    USBTC08_UNITS_K = 2  # Kelvin
+    USBTC08_UNITS_R = 3  # Rankine
+
+    STREAM_BUFFER_LEN = 64  # Readings fetched per usb_tc08_get_temp call
+
+    def __init__(self, channels=(1,), tc_type='K', mains_hz=60, stream_interval_ms=None):
+        self.tc08 = DirectTC08()
+        self.channels = sorted(set(channels))
+        self.tc_type_code = ord(tc_type.upper())
+        self.mains_hz = 60 if mains_hz not in (50, 60) else mains_hz
+        self.handle = c_int16(0)
+
+        # Streaming mode: the unit converts continuously and get_latest() only drains
+        # its buffer. 0 picks the fastest interval the unit supports; None uses get_single
+        self.stream_interval_ms = stream_interval_ms
+        self.streaming = False
+        self._stream_temps = (c_float * self.STREAM_BUFFER_LEN)()
+        self._stream_times = (c_int32 * self.STREAM_BUFFER_LEN)()
+        self._stream_overflow = c_int16(0)
+        self._stream_overflow_ref = byref(self._stream_overflow)
+        # Zero-copy NumPy views of the stream buffers for get_temp_batch
+        self._stream_temps_np = np.frombuffer(self._stream_temps, dtype=np.float32)
+        self._stream_times_np = np.frombuffer(self._stream_times, dtype=np.int32)
+        self._latest = []
+
+        # Readings are positional: index 0 is the cold junction, then self.channels in order.
+        # The hardware channel and dict key of each position are resolved once here
+        self._positions = (0, *self.channels)
+        self._keys = ('cold_junction', *[f'channel_{ch}' for ch in self.channels])
+
+        # Per-call scratch for get_single, reused across samples (one reader per instance)
+        self._get_single = self.tc08.dll.usb_tc08_get_single
+        self._temps = (c_float * 9)()
+        # Zero-copy NumPy view of _temps and the slots read from it, in _positions order
+        self._temps_np = np.frombuffer(self._temps, dtype=np.float32)
+        self._position_idx = np.array(self._positions, dtype=np.intp)
+        self._overflow = c_int16(0)
+        self._overflow_ref = byref(self._overflow)
+
+    def open(self):
+        """Open connection to TC-08 unit"""
+        self.handle = c_int16(self.tc08.dll.usb_tc08_open_unit())
+
+        if self.handle.value <= 0:
+            error_code = self.tc08.dll.usb_tc08_get_last_error(c_int16(0))
+            raise RuntimeError(f"TC-08 not found or driver issue. Error code: {error_code}")
+
+        # Set mains frequency (0 = 50Hz, 1 = 60Hz)
+        mains_setting = 1 if self.mains_hz == 60 else 0
+        result = self.tc08.dll.usb_tc08_set_mains(self.handle, c_int16(mains_setting))
+        if result == 0:
+            raise RuntimeError("Failed to set mains frequency")
+
+        # Disable cold junction as measurement channel (still used for compensation)
+        self.tc08.dll.usb_tc08_set_channel(self.handle, c_int16(0), c_char(ord(' ')))
+
+        # Configure thermocouple channels
+        for ch in self.channels:
+            result = self.tc08.dll.usb_tc08_set_channel(self.handle, c_int16(ch), c_char(self.tc_type_code))
+            if result == 0:
+                raise RuntimeError(f"Failed to configure channel {ch}")
+
+        print(f"TC-08 opened successfully with handle {self.handle.value}")
+
+        if self.stream_interval_ms is not None:
+            self.start_streaming(self.stream_interval_ms)
+
+    def start_streaming(self, interval_ms=0):
+        """Put the unit in streaming mode, converting every interval_ms (0 = fastest supported)."""
+        # get_single reports the cold junction regardless, but in streaming mode it only has
+        # readings while channel 0 is enabled (any type other than ' ' enables it)
+        if self.tc08.dll.usb_tc08_set_channel(self.handle, c_int16(0), c_char(self.tc_type_code)) == 0:
+            raise RuntimeError("Failed to enable the cold junction channel for streaming")
+
+        minimum = self.tc08.dll.usb_tc08_get_minimum_interval_ms(self.handle)
+        interval = max(int(interval_ms), minimum)
+        if self.tc08.dll.usb_tc08_run(self.handle, interval) == 0:
+            error_code = self.tc08.dll.usb_tc08_get_last_error(self.handle)
+            raise RuntimeError(f"Failed to start streaming. Error code: {error_code}")
+        self.streaming = True
+        # Every channel, cold junction included, is None until its first reading arrives
+        self._latest = [None] * len(self._positions)
+        print(f"TC-08 streaming every {interval} ms")
+
+    def stop_streaming(self):
+        if self.streaming:
+            self.tc08.dll.usb_tc08_stop(self.handle)
+            self.streaming = False
+            # Back to the get_single setup made in open()
+            self.tc08.dll.usb_tc08_set_channel(self.handle, c_int16(0), c_char(ord(' ')))
+
+    def get_latest(self, units=USBTC08_UNITS_C, out=None):
+        """Newest streamed reading of every configured channel, same keys as get_single().
+
+        Buffered readings are drained and only the last one per channel is kept; a channel
+        with nothing new since the previous call keeps its previous value.
+        """
+        if not self.streaming:
+            raise RuntimeError("TC-08 is not streaming")
+
+        latest = self._latest
+        self._drain_stream(units)
+        if None in latest:
+            # Right after usb_tc08_run the first conversion may still be in progress
+            deadline = time.perf_counter() + 2.0
+            while None in latest and time.perf_counter() < deadline:
+                time.sleep(0.02)
+                self._drain_stream(units)
+            if None in latest:
+                raise RuntimeError("TC-08 has not produced a streamed reading yet")
+        if out is not None:
+            out[:] = latest
+            return out
+        return self.as_dict(latest)
+
+    def _drain_stream(self, units):
+        dll = self.tc08.dll
+        get_temp = dll.usb_tc08_get_temp
+        handle = self.handle.value
+        temps, times = self._stream_temps, self._stream_times
+        overflow_ref = self._stream_overflow_ref
+        latest = self._latest
+        buffer_len = self.STREAM_BUFFER_LEN
+
+        for i, ch in enumerate(self._positions):
+            while True:
+                n = get_temp(handle, temps, times, buffer_len, overflow_ref, ch, units, 0)
+                if n < 0:
+                    error_code = dll.usb_tc08_get_last_error(handle)
+                    raise RuntimeError(f"Failed to get streamed readings. Error code: {error_code}")
+                if n > 0:
+                    latest[i] = temps[n - 1]
+                if n < buffer_len:
+                    break
+            if self._stream_overflow.value:
+                print(f"Warning: Overflow detected on channel {ch}")
+
+    def get_temp_batch(self, channel, units=USBTC08_UNITS_C, fill_missing=False):
+        """Drain up to STREAM_BUFFER_LEN streamed readings of one channel (0 = cold junction).
+
+        Returns (temps, times_ms) as NumPy views over the reader's stream buffers, oldest
+        first; they are only valid until the next streaming call, so copy them to keep them.
+        Readings taken here are no longer seen by get_latest().
+        """
+        if not self.streaming:
+            raise RuntimeError("TC-08 is not streaming")
+
+        n = self.tc08.dll.usb_tc08_get_temp(
+            self.handle.value, self._stream_temps, self._stream_times, self.STREAM_BUFFER_LEN,
+            self._stream_overflow_ref, channel, units, int(fill_missing)
+        )
+        if n < 0:
+            error_code = self.tc08.dll.usb_tc08_get_last_error(self.handle)
+            raise RuntimeError(f"Failed to get streamed readings. Error code: {error_code}")
+        if self._stream_overflow.value:
+            print(f"Warning: Overflow detected on channel {channel}")
+        return self._stream_temps_np[:n], self._stream_times_np[:n]
+
+    def as_dict(self, readings):
+        """Positional readings ([cold_junction, *channels]) as the get_single() dict."""
+        return dict(zip(self._keys, readings))
+
+    def close(self):
+        """Close connection to TC-08 unit"""
+        if self.handle.value > 0:
+            self.stop_streaming()
+            self.tc08.dll.usb_tc08_close_unit(self.handle)
+            self.handle = c_int16(0)
+            print("TC-08 closed")
+
+    def get_single(self, units=USBTC08_UNITS_C, out=None):
+        """Get single temperature readings from all configured channels
+
+        With out (a mutable sequence of 1 + len(channels), e.g. a float64 numpy array), the
+        readings are stored there as [cold_junction, *channels] and out is returned instead
+        of a new dict. A numpy out is filled with one gather from the DLL's buffer.
+        """
+        handle = self.handle.value
+        if handle <= 0:
+            raise RuntimeError("TC-08 not open")
+        if self.streaming:
+            return self.get_latest(units, out)
+
+        temps = self._temps
+        overflow = self._overflow
+
+        # argtypes already convert plain ints to c_int16
+        result = self._get_single(handle, temps, self._overflow_ref, units)
+
+        if result == 0:
+            error_code = self.tc08.dll.usb_tc08_get_last_error(handle)
+            raise RuntimeError(f"Failed to get readings. Error code: {error_code}")
+
+        if overflow.value != 0:
+            overflow_channels = list(_OVERFLOW_CHANNELS[overflow.value & 0x1FF])
+            print(f"Warning: Overflow detected on channels: {overflow_channels}")
+
+        if isinstance(out, np.ndarray):
+            out[:] = self._temps_np[self._position_idx]
+            return out
+        if out is not None:
+            for i, ch in enumerate(self._positions):
+                out[i] = temps[ch]
+            return out
+        return self.as_dict(self._temps_np[self._position_idx].tolist())
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()